@@ -2,92 +2,184 @@
 基础数据生成器
 生成400个教师和20个考场的基础信息，供系统使用
 """
-import random
 import json
-from typing import List, Dict
+from dataclasses import asdict, is_dataclass
+from enum import Enum
+from typing import Any, List, Dict
+
+import numpy as np
+
 from models import Teacher, Room, SubjectType
 
+try:
+    import orjson
+except ImportError:  # orjson为可选加速依赖，缺失时回退到标准库json
+    orjson = None
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba为可选加速依赖，缺失时使用NumPy向量化实现
+    NUMBA_AVAILABLE = False
+
+# 写文件缓冲区大小（64KB），减少write系统调用次数
+WRITE_BUFFER_SIZE = 1 << 16
+
+# 授课日期与节次（模块级常量，避免每个教师重复构造列表）
+_DAYS = ("2024-01-15", "2024-01-16", "2024-01-17", "2024-01-18", "2024-01-19")
+_TIME_SLOTS = ("第1节", "第2节", "第3节", "第4节", "第5节", "第6节", "第7节", "第8节", "第9节")
+_MAX_DAILY_LESSONS = 3  # 每天最多授课节数
+
+
+def _gen_numeric_loop(experience_years, load_jitter, slot_keys, daily_counts):
+    """数值生成内核（逐教师循环，供numba编译）
+
+    返回 (历史负荷, 授课节次索引)，节次索引形状为 (教师数, 天数, 3)，未使用位置填-1。
+    """
+    count, n_days, _ = slot_keys.shape
+    loads = np.empty(count, dtype=np.float64)
+    slot_indices = np.full((count, n_days, _MAX_DAILY_LESSONS), -1, dtype=np.int64)
+    for i in range(count):
+        loads[i] = 100.0 + experience_years[i] * 10.0 + load_jitter[i]
+        for d in range(n_days):
+            order = np.argsort(slot_keys[i, d])
+            for k in range(daily_counts[i, d]):
+                slot_indices[i, d, k] = order[k]
+    return loads, slot_indices
+
+
+def _gen_numeric_numpy(experience_years, load_jitter, slot_keys, daily_counts):
+    """数值生成内核（NumPy向量化实现，与_gen_numeric_loop结果一致）"""
+    loads = 100.0 + experience_years * 10.0 + load_jitter
+    slot_indices = np.argsort(slot_keys, axis=2)[:, :, :_MAX_DAILY_LESSONS]
+    slot_indices[np.arange(_MAX_DAILY_LESSONS) >= daily_counts[:, :, None]] = -1
+    return loads, slot_indices
+
+
+# 有numba时编译循环内核（cache=True缓存编译产物，后续运行无需重新编译）
+_gen_numeric = njit(cache=True)(_gen_numeric_loop) if NUMBA_AVAILABLE else _gen_numeric_numpy
+
+
+def _enum_default(obj: Any) -> Any:
+    """JSON序列化兜底：枚举输出其值，其余对象转为字符串"""
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+def _dumps_json(data: Any, pretty: bool = False) -> bytes:
+    """序列化为UTF-8字节串，优先使用orjson
+
+    数据文件仅供程序读取，默认输出紧凑格式；pretty=True时缩进输出，便于人工查看。
+    orjson可直接序列化dataclass与枚举；标准库回退路径先用dataclasses.asdict展开。
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_enum_default,
+                            option=orjson.OPT_INDENT_2 if pretty else 0)
+    if isinstance(data, list):
+        data = [asdict(item) if is_dataclass(item) else item for item in data]
+    elif is_dataclass(data):
+        data = asdict(data)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2, default=_enum_default).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'),
+                      default=_enum_default).encode('utf-8')
+
+
+def _write_bytes(file_path: str, payload: bytes) -> None:
+    """通过缓冲流一次性写入文件"""
+    with open(file_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(payload)
+        f.flush()
+
 
 class BasicDataGenerator:
     """基础数据生成器"""
 
     def __init__(self, seed=42):
-        random.seed(seed)
+        self.nprng = np.random.default_rng(seed)
         self.subjects = list(SubjectType)
         self.grades = ["高一", "高二", "高三"]
         self.buildings = ["教学楼A", "教学楼B", "教学楼C", "实验楼", "综合楼"]
 
     def generate_teachers(self, count: int = 400) -> List[Teacher]:
         """生成教师数据"""
-        teachers = []
+        teachers: List[Teacher] = [None] * count  # 预分配，避免append扩容
 
         # 按科目平均分配教师
         teachers_per_subject = count // len(self.subjects)
         remaining = count % len(self.subjects)
 
+        # 批量抽取随机数：教龄、负荷扰动、每天授课节数、节次排序键
+        experience_years = self.nprng.integers(1, 31, size=count)
+        load_jitter = self.nprng.uniform(-50, 50, size=count)
+        daily_counts = self.nprng.integers(1, _MAX_DAILY_LESSONS + 1, size=(count, len(_DAYS)))
+        slot_keys = self.nprng.random((count, len(_DAYS), len(_TIME_SLOTS)))
+
+        # 历史负荷（基于经验）与授课节次（对随机键排序后取前k个即为无放回抽样）
+        loads, slot_indices = _gen_numeric(experience_years, load_jitter, slot_keys, daily_counts)
+        historical_loads = loads.tolist()
+        slot_indices = slot_indices.tolist()
+
         teacher_id = 1
         for i, subject in enumerate(self.subjects):
             # 每个科目的教师数量
             subject_count = teachers_per_subject + (1 if i < remaining else 0)
+            name_prefix = f"{subject.value[:2]}老师"  # 同科目教师共用姓名前缀
 
             for j in range(subject_count):
                 grade = self.grades[j % len(self.grades)]
 
-                # 生成历史负荷（基于经验）
-                experience_years = random.randint(1, 30)
-                historical_load = 100 + experience_years * 10 + random.uniform(-50, 50)
-
                 teacher = Teacher(
                     id=teacher_id,
-                    name=f"{subject.value[:2]}老师{teacher_id:03d}",
+                    name=f"{name_prefix}{teacher_id:03d}",
                     subject=subject,
                     grade=grade,
-                    historical_load=historical_load
+                    historical_load=historical_loads[teacher_id - 1]
                 )
 
                 # 生成授课时间表
-                self._generate_teaching_schedule(teacher)
+                self._generate_teaching_schedule(teacher, slot_indices[teacher_id - 1])
 
-                # 随机生成请假和固定任务
-                self._generate_teacher_constraints(teacher)
-
-                teachers.append(teacher)
+                teachers[teacher_id - 1] = teacher
                 teacher_id += 1
 
+        # 随机生成请假和固定任务
+        self._generate_teacher_constraints(teachers)
+
         return teachers
 
-    def _generate_teaching_schedule(self, teacher: Teacher):
-        """生成授课时间表"""
-        days = ["2024-01-15", "2024-01-16", "2024-01-17", "2024-01-18", "2024-01-19"]
-        time_slots = ["第1节", "第2节", "第3节", "第4节", "第5节", "第6节", "第7节", "第8节", "第9节"]
+    def _generate_teaching_schedule(self, teacher: Teacher, slot_indices: List[List[int]]):
+        """根据预先抽样的节次索引生成授课时间表"""
+        for day, daily_indices in zip(_DAYS, slot_indices):
+            # 每天安排1-3节课（-1为未使用的占位）
+            teacher.teaching_schedule[day] = [_TIME_SLOTS[i] for i in daily_indices if i >= 0]
 
-        for day in days:
-            # 每天安排1-3节课
-            daily_slots = random.sample(time_slots, random.randint(1, 3))
-            teacher.teaching_schedule[day] = daily_slots
+    def _generate_teacher_constraints(self, teachers: List[Teacher]):
+        """生成教师约束条件（所有随机决策一次性向量化抽取）"""
+        count = len(teachers)
+        rng = self.nprng
 
-    def _generate_teacher_constraints(self, teacher: Teacher):
-        """生成教师约束条件"""
         # 10%的教师有请假
-        if random.random() < 0.1:
-            days = ["2024-01-15", "2024-01-16", "2024-01-17", "2024-01-18", "2024-01-19"]
-            time_slots = ["第1节", "第2节", "第3节", "第4节", "第5节", "第6节", "第7节", "第8节", "第9节"]
-
-            leave_day = random.choice(days)
-            leave_slot = random.choice(time_slots)
-            teacher.leave_times.append((leave_day, leave_slot))
+        has_leave = (rng.random(count) < 0.1).tolist()
+        leave_days = rng.integers(0, len(_DAYS), size=count).tolist()
+        leave_slots = rng.integers(0, len(_TIME_SLOTS), size=count).tolist()
 
         # 15%的教师有固定坐班
-        if random.random() < 0.15:
-            days = ["2024-01-15", "2024-01-16", "2024-01-17", "2024-01-18", "2024-01-19"]
+        has_duty = (rng.random(count) < 0.15).tolist()
+        duty_days = rng.integers(0, len(_DAYS), size=count).tolist()
+        duty_rooms = rng.integers(1, 101, size=count).tolist()
 
-            duty_day = random.choice(days)
-            duty_slot = "第9节"  # 通常晚上
-            teacher.fixed_duties.append((duty_day, duty_slot, f"房间{random.randint(1, 100):03d}"))
+        for i, teacher in enumerate(teachers):
+            if has_leave[i]:
+                teacher.leave_times.append((_DAYS[leave_days[i]], _TIME_SLOTS[leave_slots[i]]))
+            if has_duty[i]:
+                duty_slot = "第9节"  # 通常晚上
+                teacher.fixed_duties.append((_DAYS[duty_days[i]], duty_slot, f"房间{duty_rooms[i]:03d}"))
 
     def generate_rooms(self, count: int = 20) -> List[Room]:
         """生成考场数据"""
-        rooms = []
+        rooms: List[Room] = [None] * count  # 预分配，避免append扩容
 
         for i in range(1, count + 1):
             building = self.buildings[(i-1) % len(self.buildings)]
@@ -95,11 +187,11 @@ class BasicDataGenerator:
 
             # 根据楼层和建筑确定容量
             if building == "实验楼":
-                capacity = random.choice([25, 30])  # 实验室容量较小
+                capacity = int(self.nprng.choice([25, 30]))  # 实验室容量较小
             elif floor in ["1", "2"]:
-                capacity = random.choice([50, 55])  # 低层大教室
+                capacity = int(self.nprng.choice([50, 55]))  # 低层大教室
             else:
-                capacity = random.choice([35, 40, 45])  # 普通教室
+                capacity = int(self.nprng.choice([35, 40, 45]))  # 普通教室
 
             room = Room(
                 id=i,
@@ -108,7 +200,7 @@ class BasicDataGenerator:
                 building=building,
                 floor=floor
             )
-            rooms.append(room)
+            rooms[i - 1] = room
 
         return rooms
 
@@ -116,38 +208,9 @@ class BasicDataGenerator:
                     teacher_file: str = "teachers.json",
                     room_file: str = "rooms.json"):
         """保存数据到文件"""
-        # 保存教师数据
-        teacher_data = []
-        for teacher in teachers:
-            teacher_dict = {
-                'id': teacher.id,
-                'name': teacher.name,
-                'subject': teacher.subject.value,
-                'grade': teacher.grade,
-                'historical_load': teacher.historical_load,
-                'teaching_schedule': teacher.teaching_schedule,
-                'leave_times': teacher.leave_times,
-                'fixed_duties': teacher.fixed_duties
-            }
-            teacher_data.append(teacher_dict)
-
-        with open(teacher_file, 'w', encoding='utf-8') as f:
-            json.dump(teacher_data, f, ensure_ascii=False, indent=2)
-
-        # 保存考场数据
-        room_data = []
-        for room in rooms:
-            room_dict = {
-                'id': room.id,
-                'name': room.name,
-                'capacity': room.capacity,
-                'building': room.building,
-                'floor': room.floor
-            }
-            room_data.append(room_dict)
-
-        with open(room_file, 'w', encoding='utf-8') as f:
-            json.dump(room_data, f, ensure_ascii=False, indent=2)
+        # 保存教师与考场数据（dataclass直接序列化，无需逐字段构造字典）
+        _write_bytes(teacher_file, _dumps_json(teachers))
+        _write_bytes(room_file, _dumps_json(rooms))
 
         print(f"✅ 已生成 {len(teachers)} 名教师数据 → {teacher_file}")
         print(f"✅ 已生成 {len(rooms)} 个考场数据 → {room_file}")
@@ -170,10 +233,10 @@ def main():
 
     # 显示示例数据
     print("\n📊 教师数据示例：")
-    print(json.dumps(teachers[0].__dict__, default=str, ensure_ascii=False, indent=2))
+    print(_dumps_json(teachers[0], pretty=True).decode('utf-8'))
 
     print("\n🏢 考场数据示例：")
-    print(json.dumps(rooms[0].__dict__, default=str, ensure_ascii=False, indent=2))
+    print(_dumps_json(rooms[0], pretty=True).decode('utf-8'))
 
 
 if __name__ == "__main__":
@@ -7,7 +7,8 @@
 
 from datetime import datetime
 import os
-from typing import Dict, List, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
 from models import SubjectType
 
 
@@ -250,9 +251,13 @@ def is_long_subject(subject_type: SubjectType) -> bool:
     return subject_type in ExamConfig.LONG_SUBJECTS
 
 
-def get_time_slots() -> Dict[str, Tuple[str, str]]:
-    """获取时间段配置"""
-    return ExamConfig.TIME_SLOTS.copy()
+# 时间段配置的只读视图（零拷贝），需要修改时调用方应先dict()复制
+_TIME_SLOTS_VIEW: Mapping[str, Tuple[str, str]] = MappingProxyType(ExamConfig.TIME_SLOTS)
+
+
+def get_time_slots() -> Mapping[str, Tuple[str, str]]:
+    """获取时间段配置（只读）"""
+    return _TIME_SLOTS_VIEW
 
 
 def calculate_slot_duration(slot_name: str) -> int:
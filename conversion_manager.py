@@ -5,14 +5,15 @@
 统一管理数据转换逻辑，减少重复和复杂性
 """
 
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timedelta
 
 from config import (
     ExamConfig, SubjectConfig, DataConfig, PathConfig,
-    get_subject_type, get_subject_name, get_exam_duration
+    get_subject_name, get_exam_duration
 )
-from utils import DataUtils, FileUtils, TimeUtils, ModelUtils
+from utils import DataUtils, FileUtils, TimeUtils, ModelUtils, ScheduleEncoder
 from validators import ExamScheduleValidator, DataFileValidator, ConversionValidator
 from models import (
     Teacher, Room, TimeSlot, Exam, SubjectType,
@@ -20,6 +21,8 @@ from models import (
 )
 from config import ConversionConfig
 
+logger = logging.getLogger(__name__)
+
 
 class ConversionManager:
     """简化的转换管理器"""
@@ -38,6 +41,13 @@ class ConversionManager:
         self._loaded_teachers_data = None
         self._loaded_rooms_data = None
 
+        # 基准日期（每次转换开始时解析一次）与日期换算缓存 {"第X天": 实际日期}
+        self._base_dt: Optional[datetime] = None
+        self._date_cache: Dict[str, str] = {}
+
+        # 按容量优先级排好序的考场列表 {容量门槛: 达标考场 + 其他考场}，基础数据加载后构建
+        self._room_priority_lists: Dict[int, List[Room]] = {}
+
     def convert_exam_schedule(self, exam_schedule_data: List[Dict[str, Any]],
                             base_date: str = "2024-01-15",
                             use_existing_data: bool = True) -> ExamSchedule:
@@ -51,11 +61,12 @@ class ConversionManager:
         # Step 2: 加载或生成基础数据
         self._load_or_generate_data(use_existing_data)
 
-        # Step 3: 简化时间段生成
-        self._generate_time_slots_simple(validated_schedule, base_date)
+        # Step 3: 简化时间段生成（同时得到每场考试对应的时间段）
+        self._set_base_date(base_date)
+        exam_slot_pairs = self._generate_time_slots_simple(validated_schedule)
 
         # Step 4: 简化考试对象创建
-        self._create_exam_objects_simple(validated_schedule)
+        self._create_exam_objects_simple(exam_slot_pairs)
 
         # Step 5: 创建最终排考数据结构
         final_schedule = self._create_exam_schedule()
@@ -120,6 +131,9 @@ class ConversionManager:
             print("🔧 生成新的基础数据...")
             self._generate_basic_data()
 
+        # 考场在转换过程中不再变化，容量分组只需计算一次
+        self._build_room_priority_lists()
+
     def _generate_basic_data(self) -> None:
         """生成基础数据（确保足够数量）"""
         from basic_data_generator import BasicDataGenerator
@@ -163,23 +177,25 @@ class ConversionManager:
         generator.save_to_files(self.teachers, self.rooms, teachers_file, rooms_file)
         print(f"  ✅ 基础数据生成完成，已覆盖旧数据")
 
-    def _generate_time_slots_simple(self, exam_schedule: List[Dict[str, Any]], base_date: str) -> None:
-        """简化时间段生成"""
+    def _generate_time_slots_simple(self, exam_schedule: List[Dict[str, Any]]
+                                    ) -> List[Tuple[Dict[str, Any], TimeSlot]]:
+        """简化时间段生成，返回 [(考试数据, 对应时间段)] 供考试对象创建直接使用"""
         self.time_slots = []
+        exam_slot_pairs = []
 
         # 直接为每个考试创建唯一时间段，避免复杂逻辑
-        used_slots = set()  # 避免重复
+        used_slots: Dict[str, TimeSlot] = {}  # 避免重复
         slot_id = 1
 
         for exam in exam_schedule:
             # 计算实际日期
-            day_num = TimeUtils.parse_day_number(exam['date'])
-            actual_date = TimeUtils.calculate_actual_date(base_date, day_num)
+            actual_date = self._get_actual_date(exam['date'])
 
             # 创建唯一标识
             slot_key = f"{actual_date}_{exam['time_slot']}_{exam['start_time']}-{exam['end_time']}"
 
-            if slot_key not in used_slots:
+            time_slot = used_slots.get(slot_key)
+            if time_slot is None:
                 time_slot = TimeSlot(
                     id=f"slot_{slot_id}",
                     name=f"{actual_date} {exam['time_slot']} {exam['start_time']}-{exam['end_time']}",
@@ -192,42 +208,44 @@ class ConversionManager:
                 )
 
                 self.time_slots.append(time_slot)
-                used_slots.add(slot_key)
+                used_slots[slot_key] = time_slot
                 slot_id += 1
 
-        print(f"✅ 创建了{len(self.time_slots)}个时间段")
+            exam_slot_pairs.append((exam, time_slot))
 
-    def _create_exam_objects_simple(self, exam_schedule: List[Dict[str, Any]]) -> None:
+        print(f"✅ 创建了{len(self.time_slots)}个时间段")
+        return exam_slot_pairs
+
+    def _set_base_date(self, base_date: str) -> None:
+        """解析基准日期并清空日期换算缓存"""
+        self._base_dt = datetime.strptime(base_date, "%Y-%m-%d")
+        self._date_cache = {}
+
+    def _get_actual_date(self, date_str: str) -> str:
+        """将"第X天"换算为实际日期（基于已解析的基准日期），相同输入只换算一次"""
+        actual_date = self._date_cache.get(date_str)
+        if actual_date is None:
+            day_num = TimeUtils.parse_day_number(date_str)
+            actual_date = (self._base_dt + timedelta(days=day_num - 1)).strftime("%Y-%m-%d")
+            self._date_cache[date_str] = actual_date
+        return actual_date
+
+    def _create_exam_objects_simple(self, exam_slot_pairs: List[Tuple[Dict[str, Any], TimeSlot]]) -> None:
         """简化考试对象创建"""
         self.exams = []
 
-        print(f"    📊 开始处理 {len(exam_schedule)} 场考试的安排...")
-
-        # 创建时间段查找表（简化版）
-        time_slot_map = {}
-        for slot in self.time_slots:
-            key = (slot.date, slot.start_time)  # 使用日期和开始时间作为唯一标识
-            time_slot_map[key] = slot
+        print(f"    📊 开始处理 {len(exam_slot_pairs)} 场考试的安排...")
 
         processed_exams = 0
-        skipped_exams = 0
 
-        for exam_data in exam_schedule:
-            # 获取科目类型
-            subject_type = get_subject_type(exam_data['subject'])
-
-            # 计算实际日期
-            day_num = TimeUtils.parse_day_number(exam_data['date'])
-            actual_date = TimeUtils.calculate_actual_date("2024-01-15", day_num)
-
-            # 查找对应的时间段（精确匹配）
-            time_slot_key = (actual_date, exam_data['start_time'])
-            time_slot = time_slot_map.get(time_slot_key)
+        # 循环内频繁使用的函数和常量绑定为局部变量
+        subject_map_get = SubjectConfig.SUBJECT_MAPPING.get
+        default_subject = SubjectType.CHINESE
+        long_subjects = ExamConfig.LONG_SUBJECTS
 
-            if not time_slot:
-                print(f"⚠️ 警告：找不到对应时间段，跳过考试: {exam_data['subject']}")
-                skipped_exams += 1
-                continue
+        for exam_data, time_slot in exam_slot_pairs:
+            # 获取科目类型
+            subject_type = subject_map_get(exam_data['subject'], default_subject)
 
             # 分配考场（简化版）
             allocated_rooms = self._allocate_rooms_simple(exam_data['subject'])
@@ -237,14 +255,15 @@ class ConversionManager:
                 subject=subject_type,
                 time_slot=time_slot,
                 rooms=allocated_rooms,
-                is_long_subject=subject_type in ExamConfig.LONG_SUBJECTS
+                is_long_subject=subject_type in long_subjects
             )
 
             self.exams.append(exam)
             processed_exams += 1
-            print(f"    📋 考试{exam_data['subject']}({exam_data['date']}-{exam_data['start_time']})分配了{len(allocated_rooms)}个考场")
+            logger.debug("考试%s(%s-%s)分配了%d个考场", exam_data['subject'],
+                         exam_data['date'], exam_data['start_time'], len(allocated_rooms))
 
-        print(f"✅ 成功创建{processed_exams}个考试对象，跳过{skipped_exams}个")
+        print(f"✅ 成功创建{processed_exams}个考试对象")
 
         # 计算总的预期监考任务数
         total_invigilations = sum(len(exam.rooms) for exam in self.exams)
@@ -260,25 +279,43 @@ class ConversionManager:
             # 长时科目优先选择大容量考场
             if subject in ['语文', '数学', '英语']:
                 # 先尝试大容量考场，不足时补充其他考场
-                large_rooms = [r for r in self.rooms if r.capacity >= 40]
-                other_rooms = [r for r in self.rooms if r not in large_rooms]
-                allocated_rooms = (large_rooms + other_rooms)[:target_rooms]
+                allocated_rooms = self._get_room_priority_list(40)[:target_rooms]
                 room_type = "大容量优先"
             else:
                 # 短时科目优先选择中等容量考场
-                medium_rooms = [r for r in self.rooms if r.capacity >= 30]
-                other_rooms = [r for r in self.rooms if r not in medium_rooms]
-                allocated_rooms = (medium_rooms + other_rooms)[:target_rooms]
+                allocated_rooms = self._get_room_priority_list(30)[:target_rooms]
                 room_type = "中等容量优先"
         else:
             # 考场总数不足20个时，使用所有考场
             allocated_rooms = self.rooms[:target_rooms]
             room_type = "全部可用"
 
-        print(f"    🏫 {subject}考试分配{len(allocated_rooms)}个考场 ({room_type})")
+        logger.debug("%s考试分配%d个考场 (%s)", subject, len(allocated_rooms), room_type)
 
         return allocated_rooms
 
+    def _partition_rooms_by_capacity(self, min_capacity: int) -> Tuple[List[Room], List[Room]]:
+        """单次遍历将考场按容量划分为 (达标考场, 其他考场)，保持原有顺序"""
+        qualified_rooms, other_rooms = [], []
+        for room in self.rooms:
+            (qualified_rooms if room.capacity >= min_capacity else other_rooms).append(room)
+        return qualified_rooms, other_rooms
+
+    def _build_room_priority_lists(self) -> None:
+        """预先构建大容量优先(>=40)与中等容量优先(>=30)的考场排列"""
+        self._room_priority_lists = {}
+        for min_capacity in (40, 30):
+            qualified_rooms, other_rooms = self._partition_rooms_by_capacity(min_capacity)
+            self._room_priority_lists[min_capacity] = qualified_rooms + other_rooms
+
+    def _get_room_priority_list(self, min_capacity: int) -> List[Room]:
+        """获取按容量优先级排列的考场列表（未预先构建时现场计算）"""
+        rooms = self._room_priority_lists.get(min_capacity)
+        if rooms is None:
+            qualified_rooms, other_rooms = self._partition_rooms_by_capacity(min_capacity)
+            rooms = self._room_priority_lists[min_capacity] = qualified_rooms + other_rooms
+        return rooms
+
     def _create_exam_schedule(self) -> ExamSchedule:
         """创建最终的排考数据结构"""
         # 使用统一的约束配置
@@ -295,8 +332,10 @@ class ConversionManager:
 
     def _validate_conversion_result(self) -> None:
         """验证转换结果"""
+        # 考试对象直接引用本次生成的时间段和考场，跳过交叉引用检查
         is_valid, errors = ConversionValidator.validate_conversion_result(
-            self.teachers, self.rooms, self.time_slots, self.exams
+            self.teachers, self.rooms, self.time_slots, self.exams,
+            skip_expensive_checks=True
         )
 
         if not is_valid:
@@ -327,7 +366,7 @@ class ConversionManager:
             'conversion_version': '2.0'  # 标记为简化版本
         }
 
-        success = FileUtils.save_json(result_data, output_file)
+        success = FileUtils.save_json(result_data, output_file, indent=None, cls=ScheduleEncoder)
 
         if success:
             print(f"✅ 转换结果已保存到: {output_file}")
@@ -3,92 +3,92 @@
 用于生成测试用的排考数据
 """
 import random
+from functools import lru_cache
 from typing import List, Dict, Tuple
 from datetime import datetime, timedelta
 
+import numpy as np
+
 from models import (
     Teacher, Room, TimeSlot, Exam, SubjectType, ExamMode,
     Assignment, ConstraintConfig, ExamSchedule
 )
 
 
+# 授课/请假日期与节次
+_DAYS = ("2024-01-15", "2024-01-16", "2024-01-17", "2024-01-18", "2024-01-19")
+_TIME_SLOTS = ("第1节", "第2节", "第3节", "第4节", "第5节", "第6节", "第7节", "第8节", "第9节")
+_GRADES = ("高一", "高二", "高三")
+
+
 class DataGenerator:
     """测试数据生成器"""
 
     def __init__(self, seed: int = 42):
-        random.seed(seed)
+        # 使用独立的随机数生成器，不改写全局random状态（避免影响求解器等其他模块）
+        self.rng = random.Random(seed)
+        self.nprng = np.random.default_rng(seed)
 
     def generate_teachers(self, count: int = 400) -> List[Teacher]:
-        """生成教师列表"""
+        """生成教师列表（所有随机量一次性批量抽取，循环内只组装对象）"""
         subjects = list(SubjectType)
-        grades = ["高一", "高二", "高三"]
-        teachers = []
+        rng = self.nprng
+
+        subject_idx = rng.integers(0, len(subjects), size=count).tolist()
+        grade_idx = rng.integers(0, len(_GRADES), size=count).tolist()
+        historical_loads = rng.uniform(100, 500, size=count).tolist()  # 历史负荷随机生成
+
+        # 授课时间表：每天1-3节课，对随机键排序后取前k个即为无放回抽样
+        daily_counts = rng.integers(1, 4, size=(count, len(_DAYS))).tolist()
+        slot_order = np.argsort(rng.random((count, len(_DAYS), len(_TIME_SLOTS))), axis=2).tolist()
+
+        # 10%的教师有请假，15%的教师有固定坐班
+        has_leave = (rng.random(count) < 0.1).tolist()
+        leave_days = rng.integers(0, len(_DAYS), size=count).tolist()
+        leave_slots = rng.integers(0, len(_TIME_SLOTS), size=count).tolist()
+        has_duty = (rng.random(count) < 0.15).tolist()
+        duty_days = rng.integers(0, len(_DAYS), size=count).tolist()
+        duty_rooms = rng.integers(1, 101, size=count).tolist()
 
+        teachers = [None] * count
         for i in range(count):
             teacher = Teacher(
                 id=i + 1,
                 name=f"老师{i+1:03d}",
-                subject=random.choice(subjects),
-                grade=random.choice(grades),
-                historical_load=random.uniform(100, 500)  # 历史负荷随机生成
+                subject=subjects[subject_idx[i]],
+                grade=_GRADES[grade_idx[i]],
+                historical_load=historical_loads[i]
             )
 
             # 生成授课时间表 (简化版本)
-            self._generate_teaching_schedule(teacher)
+            for d, day in enumerate(_DAYS):
+                teacher.teaching_schedule[day] = [_TIME_SLOTS[k] for k in slot_order[i][d][:daily_counts[i][d]]]
 
-            # 随机生成请假时间
-            if random.random() < 0.1:  # 10%的教师有请假
-                self._generate_leave_time(teacher)
+            # 请假时间
+            if has_leave[i]:
+                teacher.leave_times.append((_DAYS[leave_days[i]], _TIME_SLOTS[leave_slots[i]]))
 
-            # 随机生成固定坐班
-            if random.random() < 0.15:  # 15%的教师有固定坐班
-                self._generate_fixed_duty(teacher)
+            # 固定坐班（通常在第9节）
+            if has_duty[i]:
+                teacher.fixed_duties.append((_DAYS[duty_days[i]], "第9节", f"房间{duty_rooms[i]:03d}"))
 
-            teachers.append(teacher)
+            teachers[i] = teacher
 
         return teachers
 
-    def _generate_teaching_schedule(self, teacher: Teacher):
-        """生成教师授课时间表"""
-        # 简化版本：每天可能有1-3节课
-        days = ["2024-01-15", "2024-01-16", "2024-01-17", "2024-01-18", "2024-01-19"]
-        time_slots = ["第1节", "第2节", "第3节", "第4节", "第5节", "第6节", "第7节", "第8节", "第9节"]
-
-        for day in days:
-            daily_slots = random.sample(time_slots, random.randint(1, 3))
-            teacher.teaching_schedule[day] = daily_slots
-
-    def _generate_leave_time(self, teacher: Teacher):
-        """生成请假时间"""
-        days = ["2024-01-15", "2024-01-16", "2024-01-17", "2024-01-18", "2024-01-19"]
-        time_slots = ["第1节", "第2节", "第3节", "第4节", "第5节", "第6节", "第7节", "第8节", "第9节"]
-
-        day = random.choice(days)
-        slot = random.choice(time_slots)
-        teacher.leave_times.append((day, slot))
-
-    def _generate_fixed_duty(self, teacher: Teacher):
-        """生成固定坐班"""
-        days = ["2024-01-15", "2024-01-16", "2024-01-17", "2024-01-18", "2024-01-19"]
-
-        day = random.choice(days)
-        slot = "第9节"  # 通常固定坐班在第9节
-        room_id = random.randint(1, 100)
-        teacher.fixed_duties.append((day, slot, f"房间{room_id:03d}"))
-
     def generate_rooms(self, count: int = 100) -> List[Room]:
         """生成考场列表"""
         rooms = []
         buildings = ["教学楼A", "教学楼B", "教学楼C", "实验楼", "综合楼"]
 
         for i in range(count):
-            building = random.choice(buildings)
-            floor = str(random.randint(1, 6))
+            building = self.rng.choice(buildings)
+            floor = str(self.rng.randint(1, 6))
 
             room = Room(
                 id=i + 1,
                 name=f"{building}{floor}0{i % 10 + 1:02d}",
-                capacity=random.choice([30, 40, 50]),
+                capacity=self.rng.choice([30, 40, 50]),
                 building=building,
                 floor=floor
             )
@@ -158,8 +158,10 @@ class DataGenerator:
 
         return time_slots
 
-    def _calculate_duration(self, start: str, end: str) -> int:
-        """计算时间段时长（分钟）"""
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _calculate_duration(start: str, end: str) -> int:
+        """计算时间段时长（分钟），场次起止时间只有少数几种，结果缓存避免重复解析"""
         start_hour, start_min = map(int, start.split(":"))
         end_hour, end_min = map(int, end.split(":"))
 
@@ -206,7 +208,7 @@ class DataGenerator:
             time_slot = time_slots[i]
 
             # 选择考场
-            selected_rooms = random.sample(rooms, min(rooms_per_exam, len(rooms)))
+            selected_rooms = self.rng.sample(rooms, min(rooms_per_exam, len(rooms)))
 
             exam = Exam(
                 subject=subject,
@@ -2,7 +2,10 @@
 DEAP遗传算法求解器
 基于DEAP库的遗传算法实现智能排考
 """
+import os
 import random
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 from typing import List, Dict, Tuple, Optional
 from deap import base, creator, tools, algorithms
@@ -12,15 +15,146 @@ from models import (
     Assignment, ConstraintConfig, ExamSchedule
 )
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba为可选加速依赖，缺失时使用NumPy向量化实现
+    NUMBA_AVAILABLE = False
+
+
+def _eval_kernel_loop(teacher_idx, task_slot, task_date, task_duration, task_is_long,
+                      task_is_morning, task_is_afternoon, availability, fixed_duty_violation,
+                      has_fixed_duties, historical_load, lunch_pair_first, lunch_pair_second,
+                      num_slots, num_dates, room_collision_penalty, weights):
+    """适应度计算内核（逐任务循环，供numba编译），与NumPy实现的惩罚规则一致
+
+    weights依次为: 监考系数, 本次权重, 历史权重, 公平性权重, 长时科目权重,
+    午休权重, 每日负荷权重, 每日舒适上限, 集中度权重。
+    """
+    num_teachers = historical_load.shape[0]
+    num_tasks = teacher_idx.shape[0]
+
+    # 硬约束：教师时空冲突、考场时空冲突、可用性、固定任务
+    hard = room_collision_penalty
+    slot_counts = np.zeros(num_teachers * num_slots, dtype=np.int64)
+    for k in range(num_tasks):
+        t = teacher_idx[k]
+        key = t * num_slots + task_slot[k]
+        if slot_counts[key] > 0:
+            hard += 1000.0
+        slot_counts[key] += 1
+        if not availability[t, task_slot[k]]:
+            hard += 500.0
+        if has_fixed_duties and fixed_duty_violation[t, k]:
+            hard += 200.0
+    if hard > 0:
+        return hard * 10000
+
+    if num_teachers == 0:
+        return 0.0
+
+    inv_coef, current_w, historical_w = weights[0], weights[1], weights[2]
+    fairness_w, long_w, lunch_w = weights[3], weights[4], weights[5]
+    daily_w, daily_limit, concentration_w = weights[6], weights[7], weights[8]
+
+    load = np.zeros(num_teachers, dtype=np.float64)
+    long_counts = np.zeros(num_teachers, dtype=np.float64)
+    daily_counts = np.zeros(num_teachers * num_dates, dtype=np.int64)
+    has_morning = np.zeros(num_teachers * num_dates, dtype=np.bool_)
+    has_afternoon = np.zeros(num_teachers * num_dates, dtype=np.bool_)
+    for k in range(num_tasks):
+        t = teacher_idx[k]
+        load[t] += task_duration[k]
+        if task_is_long[k]:
+            long_counts[t] += 1.0
+        key = t * num_dates + task_date[k]
+        daily_counts[key] += 1
+        if task_is_morning[k]:
+            has_morning[key] = True
+        if task_is_afternoon[k]:
+            has_afternoon[key] = True
+
+    penalty = 0.0
+
+    # S-E-01: 核心公平性（加权总负荷极差）
+    max_load = -np.inf
+    min_load = np.inf
+    for t in range(num_teachers):
+        total = current_w * (load[t] * inv_coef) + historical_w * historical_load[t]
+        max_load = max(max_load, total)
+        min_load = min(min_load, total)
+    penalty += (max_load - min_load) * fairness_w
+
+    # S-E-03: 长时科目平衡
+    avg_long = long_counts.mean()
+    excess_long = 0.0
+    for t in range(num_teachers):
+        if long_counts[t] > avg_long:
+            excess_long += long_counts[t] - avg_long
+    penalty += excess_long * long_w
+
+    # S-E-04: 午休保障
+    lunch_count = 0
+    for p in range(lunch_pair_first.shape[0]):
+        for t in range(num_teachers):
+            lunch_count += (slot_counts[t * num_slots + lunch_pair_first[p]] *
+                            slot_counts[t * num_slots + lunch_pair_second[p]])
+    penalty += lunch_count * lunch_w
+
+    # S-E-06: 每日负荷 / S-E-05: 任务集中度
+    daily_excess = 0.0
+    concentrated = 0
+    for key in range(num_teachers * num_dates):
+        if daily_counts[key] > daily_limit:
+            daily_excess += daily_counts[key] - daily_limit
+        if has_morning[key] and has_afternoon[key]:
+            concentrated += 1
+    penalty += daily_excess * daily_w
+    penalty += concentrated * concentration_w
+
+    return penalty
+
+
+# 有numba时编译内核（cache=True缓存编译产物，nogil=True允许多线程并行执行）；
+# 否则适应度计算走NumPy向量化路径
+_eval_kernel = njit(cache=True, nogil=True)(_eval_kernel_loop) if NUMBA_AVAILABLE else None
+
+
+def _eval_population_loop(pop_idx, task_slot, task_date, task_duration, task_is_long,
+                          task_is_morning, task_is_afternoon, availability, fixed_duty_violation,
+                          has_fixed_duties, historical_load, lunch_pair_first, lunch_pair_second,
+                          num_slots, num_dates, room_collision_penalty, weights):
+    """批量适应度内核：对 (个体数, 染色体长度) 矩阵逐行调用单个体内核"""
+    fitness = np.empty(pop_idx.shape[0], dtype=np.float64)
+    for r in range(pop_idx.shape[0]):
+        fitness[r] = _eval_kernel(
+            pop_idx[r], task_slot, task_date, task_duration, task_is_long,
+            task_is_morning, task_is_afternoon, availability, fixed_duty_violation,
+            has_fixed_duties, historical_load, lunch_pair_first, lunch_pair_second,
+            num_slots, num_dates, room_collision_penalty, weights
+        )
+    return fitness
+
+
+_eval_population_kernel = njit(cache=True, nogil=True)(_eval_population_loop) if NUMBA_AVAILABLE else None
+
+# 每个线程至少分到的个体数，批量过小时线程调度开销大于收益
+_MIN_ROWS_PER_THREAD = 32
+
 
 class DEAPSolver:
     """DEAP遗传算法求解器"""
 
-    def __init__(self, schedule: ExamSchedule, population_size: int = 200, generations: int = 100):
+    def __init__(self, schedule: ExamSchedule, population_size: int = 200, generations: int = 100,
+                 n_jobs: Optional[int] = None):
         self.schedule = schedule
         self.population_size = population_size
         self.generations = generations
 
+        # 适应度并行评估的线程数（默认CPU核数，仅在numba内核可用时生效）
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self._executor: Optional[ThreadPoolExecutor] = None
+
         # 个体表示：为每个需要监考的考场分配一个教师ID
         self.chromosome_length = self._calculate_chromosome_length()
 
@@ -30,116 +164,385 @@ class DEAPSolver:
         self.solve_time = 0
         self.fitness_history = []
 
+        # NumPy随机数生成器（由random模块派生种子，random.seed()可复现整个求解过程）
+        self.nprng = np.random.default_rng(random.getrandbits(32))
+
         # 初始化DEAP
         self._setup_deap()
 
     def _calculate_chromosome_length(self) -> int:
-        """计算染色体长度（总监考任务数）"""
-        total_tasks = 0
-        for exam in self.schedule.exams:
-            total_tasks += len(exam.rooms)  # 每个考场需要一个监考教师
-        return total_tasks
+        """计算染色体长度（总监考任务数，每个考场需要一个监考教师）"""
+        return self.schedule.get_total_tasks()
 
     def _setup_deap(self):
         """设置DEAP框架"""
         # 创建适应度类（最小化问题）
         creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
 
-        # 创建个体类
-        creator.create("Individual", list, fitness=creator.FitnessMin)
+        # 创建个体类（基于ndarray：复制时整块拷贝内存，适应度计算可直接读取）
+        # 注：toolbox默认的clone(deepcopy)经DEAP的ndarray包装会同时复制数组与适应度，
+        # 不能替换为np.ndarray.copy，否则副本丢失fitness属性
+        creator.create("Individual", np.ndarray, fitness=creator.FitnessMin)
 
         # 创建工具箱
         self.toolbox = base.Toolbox()
 
-        # 注册基因生成器（选择可用的教师）
-        self.toolbox.register("attr_teacher", self._random_available_teacher)
-
-        # 注册个体和种群生成器
-        self.toolbox.register("individual", tools.initRepeat, creator.Individual,
-                             self.toolbox.attr_teacher, n=self.chromosome_length)
-        self.toolbox.register("population", tools.initRepeat, list, self.toolbox.individual)
+        # 注册个体和种群生成器（每个基因从该任务时间段的可用教师中抽取）
+        self.toolbox.register("individual", self._make_individual)
+        self.toolbox.register("population", self._make_population)
 
         # 注册遗传算子
-        self.toolbox.register("evaluate", self._evaluate_individual)
+        self.toolbox.register("evaluate", self._evaluate_individual_fast)
         self.toolbox.register("mate", self._crossover)
         self.toolbox.register("mutate", self._mutate, indpb=0.1)
         self.toolbox.register("select", tools.selTournament, tournsize=3)
 
+        # 预计算监考任务数组（向量化适应度计算使用）
+        self._precompute_task_arrays()
+
         # 预计算可用教师映射
         self._precompute_teacher_availability()
+        self._precompute_fixed_duty_violation()
+        self._precompute_available_by_task()
+        self._freeze_shared_arrays()
+
+    def _freeze_shared_arrays(self):
+        """将预计算数组设为只读
+
+        评估线程池中的各线程直接共享这些数组（无需序列化或拷贝），
+        只读标记保证求解期间任何路径都不会意外改写共享数据。
+        """
+        shared = [
+            self.task_slot, self.task_date, self.task_duration, self.task_is_long,
+            self.task_is_morning, self.task_is_afternoon, self.availability,
+            self.historical_load_arr, self.lunch_pair_first, self.lunch_pair_second,
+            self.teacher_ids_arr, self.teacher_idx_lookup,
+        ]
+        if self.fixed_duty_violation is not None:
+            shared.append(self.fixed_duty_violation)
+        for arr in shared:
+            arr.setflags(write=False)
 
     def _precompute_teacher_availability(self):
-        """预计算教师在各时间段的可用性"""
-        self.teacher_availability = {}
+        """预计算教师在各时间段的可用性
 
-        for time_slot in self.schedule.time_slots:
-            available_teachers = []
+        availability为 (教师数, 时间段数) 的布尔矩阵，适应度计算时直接按下标取值；
+        teacher_availability为 {时间段ID: 可用教师ID列表}。
+        """
+        teachers = self.schedule.teachers
 
-            for teacher in self.schedule.teachers:
-                if self._is_teacher_available(teacher, time_slot):
-                    available_teachers.append(teacher.id)
+        # 改卷表：grading_mask[s, e] 表示时间段s处于时间段e考试的改卷期（日期晚于考试日期）
+        self.grading_mask = (self.slot_date[:, None] - self.slot_date[None, :]) >= 1
 
-            self.teacher_availability[time_slot.id] = available_teachers
+        # 各科目的改卷时间段：对该科目全部考试时间段的改卷列做一次any归约
+        exam_slots_by_subject: Dict[SubjectType, List[int]] = {}
+        for exam in self.schedule.exams:
+            exam_slots_by_subject.setdefault(exam.subject, []).append(self.slot_index[exam.time_slot.id])
+        grading_by_subject = {
+            subject: self.grading_mask[:, exam_slots].any(axis=1)
+            for subject, exam_slots in exam_slots_by_subject.items()
+        }
+        no_grading = np.zeros(self.num_slots, dtype=bool)
+
+        # 可用 = 非改卷期 且 非请假（固定任务不影响可用性，由fixed_duty_violation单独计罚）
+        self.availability = np.empty((len(teachers), self.num_slots), dtype=bool)
+        for i, teacher in enumerate(teachers):
+            row = ~grading_by_subject.get(teacher.subject, no_grading)
+            for leave_date, leave_slot in teacher.leave_times:
+                for j, time_slot in enumerate(self.slots):
+                    if leave_date == time_slot.date and leave_slot in time_slot.name:
+                        row[j] = False
+            self.availability[i] = row
 
-    def _random_available_teacher(self) -> int:
-        """随机选择一个可用教师"""
-        # 这里需要根据具体的时间段来选择，暂时简化
-        all_teacher_ids = [t.id for t in self.schedule.teachers]
-        return random.choice(all_teacher_ids)
+        self.teacher_availability = {}
+        for j, time_slot in enumerate(self.slots):
+            self.teacher_availability[time_slot.id] = [
+                teachers[i].id for i in np.flatnonzero(self.availability[:, j]).tolist()
+            ]
+
+    def _precompute_task_arrays(self):
+        """预计算监考任务的SoA数组，下标与染色体基因位置一一对应"""
+        teachers = self.schedule.teachers
+        self.num_teachers = len(teachers)
+        self.teacher_id_to_idx = {t.id: i for i, t in enumerate(teachers)}
+        self.teacher_ids_arr = np.array([t.id for t in teachers], dtype=np.int64)
+        # 教师ID -> 教师下标的查找数组（未知ID映射为-1）
+        max_teacher_id = max(self.teacher_id_to_idx, default=0)
+        self.teacher_idx_lookup = np.full(max_teacher_id + 1, -1, dtype=np.int64)
+        for teacher_id, idx in self.teacher_id_to_idx.items():
+            self.teacher_idx_lookup[teacher_id] = idx
+        self.historical_load_arr = np.array([t.historical_load for t in teachers], dtype=np.float64)
+
+        # 时间段编号（考试引用但不在time_slots列表中的时间段追加在末尾）
+        slots = list(self.schedule.time_slots)
+        slot_index = {ts.id: i for i, ts in enumerate(slots)}
+        for exam in self.schedule.exams:
+            if exam.time_slot.id not in slot_index:
+                slot_index[exam.time_slot.id] = len(slots)
+                slots.append(exam.time_slot)
+        self.slots = slots
+        self.slot_index = slot_index
+        self.num_slots = len(slots)
+
+        # 日期编号按先后排序（YYYY-MM-DD字符串排序即时间顺序），改卷期判断只需整数比较
+        self.date_to_idx = {d: i for i, d in enumerate(sorted({ts.date for ts in slots}))}
+        self.slot_date = np.array([self.date_to_idx[ts.date] for ts in slots], dtype=np.int64)
+        self.num_dates = len(self.date_to_idx)
+
+        # 长时科目查找表：只要有一场该科目的考试为长时科目，该科目的任务均计为长时任务
+        long_subjects = self.schedule.get_long_subjects()
+
+        task_slot = []
+        task_is_long = []
+        self.task_rooms = []
+        for exam in self.schedule.exams:
+            slot_idx = slot_index[exam.time_slot.id]
+            is_long = exam.subject in long_subjects
+            for room in exam.rooms:
+                task_slot.append(slot_idx)
+                task_is_long.append(is_long)
+                self.task_rooms.append(room)
+
+        self.task_slot = np.array(task_slot, dtype=np.int64)
+        self.task_room_id = np.array([room.id for room in self.task_rooms], dtype=np.int64)
+        self.task_positions = np.arange(len(task_slot), dtype=np.int64)
+
+        # 考场时空冲突只取决于考试安排本身，与染色体无关
+        room_index = {}
+        task_room_idx = np.array([room_index.setdefault(room.id, len(room_index)) for room in self.task_rooms],
+                                 dtype=np.int64)
+        room_counts = np.bincount(task_room_idx * self.num_slots + self.task_slot)
+        self.room_collision_penalty = 1000.0 * (room_counts[room_counts > 1] - 1).sum()
+        self.task_date = self.slot_date[self.task_slot]
+        self.task_duration = np.array([ts.duration_minutes for ts in slots], dtype=np.float64)[self.task_slot]
+        self.task_is_long = np.array(task_is_long, dtype=bool)
+        self.task_is_morning = np.array([ts.is_morning for ts in slots], dtype=bool)[self.task_slot]
+        # 集中度按"上午优先"判定：既是上午又是下午的时间段只算上午
+        self.task_is_afternoon = np.array([ts.is_afternoon and not ts.is_morning for ts in slots],
+                                          dtype=bool)[self.task_slot]
+
+        # 午休配对的(上午时间段, 下午时间段)编号对，要求同一天且任一方标记了配对
+        lunch_first, lunch_second = [], []
+        for i, morning in enumerate(slots):
+            if not morning.is_morning:
+                continue
+            for j, afternoon in enumerate(slots):
+                if (afternoon.is_afternoon and afternoon.date == morning.date and
+                        (morning.is_lunch_pair_with == afternoon.id or
+                         afternoon.is_lunch_pair_with == morning.id)):
+                    lunch_first.append(i)
+                    lunch_second.append(j)
+        self.lunch_pair_first = np.array(lunch_first, dtype=np.int64)
+        self.lunch_pair_second = np.array(lunch_second, dtype=np.int64)
+
+    def _precompute_fixed_duty_violation(self):
+        """预计算固定任务违反矩阵 (教师数, 任务数)
+
+        True表示该任务处于教师的固定任务时间，但考场不是其固定任务考场。
+        没有教师设置固定任务时为None。
+        """
+        self.fixed_duty_violation = None
+        teachers = self.schedule.teachers
+        if not any(t.fixed_duties for t in teachers):
+            return
+
+        self.fixed_duty_violation = np.zeros((len(teachers), self.chromosome_length), dtype=bool)
+        task_slots = self.task_slot.tolist()
+        for i, teacher in enumerate(teachers):
+            if not teacher.fixed_duties:
+                continue
+            for k, room in enumerate(self.task_rooms):
+                time_slot = self.slots[task_slots[k]]
+                is_fixed_time = False
+                fixed_task_met = False
+                for fixed_date, fixed_slot, fixed_room in teacher.fixed_duties:
+                    if fixed_date == time_slot.date and fixed_slot in time_slot.name:
+                        is_fixed_time = True
+                        if fixed_room == room.name:
+                            fixed_task_met = True
+                            break
+                self.fixed_duty_violation[i, k] = is_fixed_time and not fixed_task_met
+
+    def _precompute_available_by_task(self):
+        """按时间段将监考任务分组，并记录每组可抽取的教师ID
+
+        同一时间段的任务可用教师相同，初始化个体时每组只需一次批量抽样。
+        """
+        all_teacher_ids = self.teacher_ids_arr
+        self.task_groups = []
+        for slot_idx, time_slot in enumerate(self.slots):
+            available = np.asarray(self.teacher_availability.get(time_slot.id, []), dtype=np.int64)
+            if len(available) == 0:
+                available = all_teacher_ids  # 无可用教师时退化为全部教师（由适应度惩罚）
+            tasks = np.flatnonzero(self.task_slot == slot_idx)
+            if len(tasks):
+                self.task_groups.append((tasks, available))
+
+        # 每个任务对应的可用教师ID数组（同组任务共享同一数组）
+        self.available_by_task = [None] * self.chromosome_length
+        for tasks, available in self.task_groups:
+            for k in tasks.tolist():
+                self.available_by_task[k] = available
+
+    def _make_individual(self):
+        """生成个体：按时间段分组，从可用教师中批量抽取基因
+
+        可用教师足够时不放回抽样，保证同一时间段内不会重复安排同一教师。
+        """
+        genes = np.empty(self.chromosome_length, dtype=np.int64)
+        for tasks, available in self.task_groups:
+            genes[tasks] = self.nprng.choice(available, size=len(tasks),
+                                             replace=len(available) < len(tasks))
+        return creator.Individual(genes)
+
+    def _make_population(self, n: int) -> list:
+        """生成种群：整个种群的基因一次性写入 (n, 染色体长度) 矩阵，每行视图即一个个体
+
+        各时间段分组对全部个体批量抽样；不放回抽样通过对随机键按行argsort实现。
+        """
+        genes = np.empty((n, self.chromosome_length), dtype=np.int64)
+        for tasks, available in self.task_groups:
+            if len(available) >= len(tasks):
+                order = np.argsort(self.nprng.random((n, len(available))), axis=1)[:, :len(tasks)]
+                genes[:, tasks] = available[order]
+            else:
+                genes[:, tasks] = self.nprng.choice(available, size=(n, len(tasks)))
 
-    def _is_teacher_available(self, teacher: Teacher, time_slot: TimeSlot) -> bool:
-        """检查教师在特定时间段是否可用"""
-        # 1. 检查请假时间
-        for leave_date, leave_slot in teacher.leave_times:
-            if leave_date == time_slot.date and leave_slot in time_slot.name:
-                return False
+        # view不会调用Individual.__init__，需手动挂上适应度对象
+        population = [row.view(creator.Individual) for row in genes]
+        for individual in population:
+            individual.fitness = creator.FitnessMin()
+        return population
 
-        # 2. 检查改卷时间
-        for exam in self.schedule.exams:
-            if (exam.subject == teacher.subject and
-                self._is_grading_period(time_slot, exam.time_slot)):
-                return False
-
-        # 3. 检查固定任务
-        for fixed_date, fixed_slot, fixed_room in teacher.fixed_duties:
-            if fixed_date == time_slot.date and fixed_slot in time_slot.name:
-                # 检查固定任务的考场是否匹配
-                for room in self.schedule.rooms:
-                    if room.name == fixed_room:
-                        return True  # 如果是固定任务，则可用但必须分配到特定考场
-
-        return True
-
-    def _is_grading_period(self, current_time: TimeSlot, exam_time: TimeSlot) -> bool:
-        """判断当前时间是否为改卷期间"""
-        from datetime import datetime, timedelta
-        current_dt = datetime.strptime(current_time.date, "%Y-%m-%d")
-        exam_dt = datetime.strptime(exam_time.date, "%Y-%m-%d")
-        date_diff = (current_dt - exam_dt).days
-        return date_diff >= 1
-
-    def _evaluate_individual(self, individual) -> Tuple[float]:
-        """评估个体的适应度（惩罚分）"""
+    def _evaluate_individual_fast(self, individual) -> Tuple[float]:
+        """评估个体的适应度（直接基于任务数组计算，不构造Assignment对象）"""
         try:
-            # 将染色体转换为监考安排
-            assignments = self._chromosome_to_assignments(individual)
+            teacher_idx = self._to_teacher_indices(individual)
+            if teacher_idx is None:
+                return (float('inf'),)
+
+            if _eval_kernel is not None:
+                return (self._evaluate_with_kernel(teacher_idx),)
 
             # 计算硬约束违反惩罚（非常高的权重）
-            hard_penalty = self._calculate_hard_constraint_penalties(assignments)
+            hard_penalty = self._calculate_hard_constraint_penalties_np(teacher_idx)
 
             # 如果有硬约束违反，直接返回高惩罚值
             if hard_penalty > 0:
                 return (hard_penalty * 10000,)
 
             # 计算软约束违反惩罚
-            soft_penalty = self._calculate_soft_constraint_penalties(assignments)
-
-            return (soft_penalty,)
+            return (self._soft_penalty_from_indices(teacher_idx),)
 
         except Exception as e:
             # 如果评估出错，返回极高的惩罚值
             return (float('inf'),)
 
+    def _evaluate_with_kernel(self, teacher_idx: np.ndarray) -> float:
+        """调用numba编译的适应度内核（硬约束违反时返回放大后的硬惩罚）"""
+        return float(_eval_kernel(teacher_idx, *self._kernel_args()))
+
+    def _kernel_args(self) -> tuple:
+        """适应度内核除教师下标外的参数（任务数组、约束矩阵与权重）"""
+        config = self.schedule.config
+        weights = np.array([
+            config.invigilation_coefficient, config.current_weight, config.historical_weight,
+            config.fairness_weight, config.long_exam_weight, config.lunch_weight,
+            config.daily_limit_weight, config.daily_comfort_limit, config.concentration_weight
+        ], dtype=np.float64)
+        has_fixed_duties = self.fixed_duty_violation is not None
+        fixed_duty_violation = (self.fixed_duty_violation if has_fixed_duties
+                                else np.zeros((1, 1), dtype=bool))
+        return (
+            self.task_slot, self.task_date, self.task_duration, self.task_is_long,
+            self.task_is_morning, self.task_is_afternoon, self.availability, fixed_duty_violation,
+            has_fixed_duties, self.historical_load_arr, self.lunch_pair_first, self.lunch_pair_second,
+            self.num_slots, self.num_dates, float(self.room_collision_penalty), weights
+        )
+
+    def _evaluate_population(self, individuals) -> np.ndarray:
+        """批量评估个体适应度，返回与individuals等长的惩罚分数组
+
+        所有个体堆叠为 (个体数, 染色体长度) 的矩阵后一次完成ID到下标的转换，
+        有numba时整批交给编译内核，否则逐行走NumPy路径。
+        """
+        fitness = np.full(len(individuals), np.inf)
+        if not individuals:
+            return fitness
+
+        pop_ids = np.stack([np.asarray(ind, dtype=np.int64) for ind in individuals])
+        if pop_ids.shape[1] != self.chromosome_length:
+            return fitness
+
+        # 批量转换教师ID -> 教师下标，含未知ID的个体保持inf
+        in_range = (pop_ids >= 0) & (pop_ids < len(self.teacher_idx_lookup))
+        pop_idx = self.teacher_idx_lookup[np.where(in_range, pop_ids, 0)]
+        valid_rows = np.flatnonzero((in_range & (pop_idx >= 0)).all(axis=1))
+        if len(valid_rows) == 0:
+            return fitness
+
+        if _eval_population_kernel is not None:
+            kernel_args = self._kernel_args()
+            n_chunks = min(self.n_jobs, len(valid_rows) // _MIN_ROWS_PER_THREAD)
+            if self._executor is not None and n_chunks > 1:
+                # 内核释放GIL，各线程并行评估种群的不同分块
+                chunks = np.array_split(valid_rows, n_chunks)
+                futures = [self._executor.submit(_eval_population_kernel,
+                                                 np.ascontiguousarray(pop_idx[rows]), *kernel_args)
+                           for rows in chunks]
+                for rows, future in zip(chunks, futures):
+                    fitness[rows] = future.result()
+            else:
+                fitness[valid_rows] = _eval_population_kernel(
+                    np.ascontiguousarray(pop_idx[valid_rows]), *kernel_args)
+        else:
+            for r in valid_rows.tolist():
+                hard_penalty = self._calculate_hard_constraint_penalties_np(pop_idx[r])
+                if hard_penalty > 0:
+                    fitness[r] = hard_penalty * 10000
+                else:
+                    fitness[r] = self._soft_penalty_from_indices(pop_idx[r])
+        return fitness
+
+    def _assign_fitness(self, individuals) -> None:
+        """批量评估并写回个体适应度"""
+        for ind, fit in zip(individuals, self._evaluate_population(individuals).tolist()):
+            ind.fitness.values = (fit,)
+
+    def _to_teacher_indices(self, individual) -> Optional[np.ndarray]:
+        """将染色体中的教师ID转换为教师下标数组，存在未知ID或长度不符时返回None"""
+        teacher_ids = np.asarray(individual, dtype=np.int64)
+        if len(teacher_ids) != len(self.task_slot):
+            return None
+        if len(teacher_ids) and (teacher_ids.min() < 0 or teacher_ids.max() >= len(self.teacher_idx_lookup)):
+            return None
+        teacher_idx = self.teacher_idx_lookup[teacher_ids]
+        if len(teacher_idx) and teacher_idx.min() < 0:
+            return None
+        return teacher_idx
+
+    def _calculate_hard_constraint_penalties_np(self, teacher_idx: np.ndarray) -> float:
+        """基于教师下标数组计算硬约束违反惩罚"""
+        penalty = 0.0
+
+        # H-E-01: 教师时空冲突（教师在同一时间有多个任务，每多一个罚1000）
+        counts = np.bincount(teacher_idx * self.num_slots + self.task_slot)
+        penalty += 1000.0 * (counts[counts > 1] - 1).sum()
+
+        # H-E-01: 考场时空冲突（与染色体无关，预先算好）
+        penalty += self.room_collision_penalty
+
+        # H-E-02, 03, 04: 教师可用性约束（教师在不可用时间被安排）
+        unavailable = np.count_nonzero(~self.availability[teacher_idx, self.task_slot])
+        penalty += 500 * unavailable
+
+        # H-E-09: 固定任务约束（固定任务时间被分配到其他考场）
+        if self.fixed_duty_violation is not None:
+            missed = np.count_nonzero(self.fixed_duty_violation[teacher_idx, self.task_positions])
+            penalty += 200 * missed
+
+        return penalty
+
     def _chromosome_to_assignments(self, chromosome: List[int]) -> List[Assignment]:
         """将染色体转换为监考安排"""
         assignments = []
@@ -166,207 +569,67 @@ class DEAPSolver:
 
         return assignments
 
-    def _calculate_hard_constraint_penalties(self, assignments: List[Assignment]) -> float:
-        """计算硬约束违反惩罚"""
-        penalty = 0.0
-
-        # H-E-01: 教师时空冲突
-        teacher_time_slots = {}
-        for assignment in assignments:
-            teacher_id = assignment.teacher.id
-            time_slot_id = assignment.time_slot.id
-            room_id = assignment.room.id
-
-            key = (teacher_id, time_slot_id)
-            if key in teacher_time_slots:
-                penalty += 1000  # 教师在同一时间有多个任务
-            else:
-                teacher_time_slots[key] = assignment
-
-        # H-E-01: 考场时空冲突
-        room_time_slots = {}
-        for assignment in assignments:
-            room_id = assignment.room.id
-            time_slot_id = assignment.time_slot.id
-
-            key = (room_id, time_slot_id)
-            if key in room_time_slots:
-                penalty += 1000  # 考场在同一时间有多个考试
-            else:
-                room_time_slots[key] = assignment
-
-        # H-E-02, 03, 04: 教师可用性约束
-        for assignment in assignments:
-            teacher = assignment.teacher
-            time_slot = assignment.time_slot
-
-            if not self._is_teacher_available(teacher, time_slot):
-                penalty += 500  # 教师在不可用时间被安排
-
-        # H-E-09: 固定任务约束
-        for assignment in assignments:
-            teacher = assignment.teacher
-            time_slot = assignment.time_slot
-            room = assignment.room
-
-            # 检查是否为固定任务
-            fixed_task_met = False
-            for fixed_date, fixed_slot, fixed_room in teacher.fixed_duties:
-                if (fixed_date == time_slot.date and
-                    fixed_slot in time_slot.name and
-                    fixed_room == room.name):
-                    fixed_task_met = True
-                    break
-
-            # 如果有固定任务但未被满足
-            if teacher.fixed_duties and not fixed_task_met:
-                # 检查是否是固定任务的时间但分配到其他考场
-                is_fixed_time = False
-                for fixed_date, fixed_slot, _ in teacher.fixed_duties:
-                    if fixed_date == time_slot.date and fixed_slot in time_slot.name:
-                        is_fixed_time = True
-                        break
-
-                if is_fixed_time:
-                    penalty += 200  # 固定任务未满足
-
-        return penalty
-
-    def _calculate_soft_constraint_penalties(self, assignments: List[Assignment]) -> float:
-        """计算软约束违反惩罚"""
+    def _soft_penalty_from_indices(self, teacher_idx: np.ndarray) -> float:
+        """基于教师下标数组向量化计算软约束惩罚"""
         config = self.schedule.config
-        penalty = 0.0
+        num_teachers = self.num_teachers
+        if num_teachers == 0:
+            return 0.0
 
-        # 准备数据结构
-        teacher_assignments = {t.id: [] for t in self.schedule.teachers}
-        for assignment in assignments:
-            teacher_assignments[assignment.teacher.id].append(assignment)
+        penalty = 0.0
 
         # S-E-01: 核心公平性（加权总负荷极差）
-        total_loads = []
-        for teacher in self.schedule.teachers:
-            teacher_assigns = teacher_assignments[teacher.id]
-
-            # 计算当前负荷
-            current_load = 0.0
-            long_exam_count = 0
-
-            for assignment in teacher_assigns:
-                duration = assignment.time_slot.duration_minutes
-                current_load += duration * config.invigilation_coefficient
-
-                # 统计长时科目
-                if any(e.subject == assignment.subject and e.is_long_subject
-                      for e in self.schedule.exams):
-                    long_exam_count += 1
-
-            # 计算加权总负荷
-            total_load = (config.current_weight * current_load +
-                         config.historical_weight * teacher.historical_load)
-            total_loads.append(total_load)
-
-        if total_loads:
-            max_load = max(total_loads)
-            min_load = min(total_loads)
-            load_range = max_load - min_load
-            penalty += load_range * config.fairness_weight
+        current_load = np.bincount(teacher_idx, weights=self.task_duration,
+                                   minlength=num_teachers) * config.invigilation_coefficient
+        total_load = (config.current_weight * current_load +
+                      config.historical_weight * self.historical_load_arr)
+        penalty += (total_load.max() - total_load.min()) * config.fairness_weight
 
         # S-E-03: 长时科目平衡
-        long_counts = []
-        for teacher in self.schedule.teachers:
-            teacher_assigns = teacher_assignments[teacher.id]
-            long_count = 0
-
-            for assignment in teacher_assigns:
-                if any(e.subject == assignment.subject and e.is_long_subject
-                      for e in self.schedule.exams):
-                    long_count += 1
-
-            long_counts.append(long_count)
-
-        if long_counts:
-            avg_long = np.mean(long_counts)
-            for count in long_counts:
-                excess = max(0, count - avg_long)
-                penalty += excess * config.long_exam_weight
-
-        # S-E-04: 午休保障
-        for teacher in self.schedule.teachers:
-            teacher_assigns = teacher_assignments[teacher.id]
-
-            # 按日期分组
-            daily_assigns = {}
-            for assignment in teacher_assigns:
-                date = assignment.time_slot.date
-                if date not in daily_assigns:
-                    daily_assigns[date] = []
-                daily_assigns[date].append(assignment)
-
-            # 检查每天的午休配对
-            for date, day_assigns in daily_assigns.items():
-                morning_assigns = [a for a in day_assigns if a.time_slot.is_morning]
-                afternoon_assigns = [a for a in day_assigns if a.time_slot.is_afternoon]
-
-                # 检查午休违反
-                for morning_assign in morning_assigns:
-                    for afternoon_assign in afternoon_assigns:
-                        # 检查是否为午休配对
-                        if (morning_assign.time_slot.is_lunch_pair_with == afternoon_assign.time_slot.id or
-                            afternoon_assign.time_slot.is_lunch_pair_with == morning_assign.time_slot.id):
-                            penalty += config.lunch_weight
-
-        # S-E-06: 每日负荷
-        for teacher in self.schedule.teachers:
-            teacher_assigns = teacher_assignments[teacher.id]
-
-            # 按日期统计任务数
-            daily_counts = {}
-            for assignment in teacher_assigns:
-                date = assignment.time_slot.date
-                daily_counts[date] = daily_counts.get(date, 0) + 1
-
-            for date, count in daily_counts.items():
-                excess = max(0, count - config.daily_comfort_limit)
-                penalty += excess * config.daily_limit_weight
-
-        # S-E-05: 任务集中度
-        for teacher in self.schedule.teachers:
-            teacher_assigns = teacher_assignments[teacher.id]
-
-            # 按日期检查上下午分布
-            daily_distribution = {}
-            for assignment in teacher_assigns:
-                date = assignment.time_slot.date
-                if date not in daily_distribution:
-                    daily_distribution[date] = {'morning': False, 'afternoon': False}
-
-                if assignment.time_slot.is_morning:
-                    daily_distribution[date]['morning'] = True
-                elif assignment.time_slot.is_afternoon:
-                    daily_distribution[date]['afternoon'] = True
-
-            for date, distribution in daily_distribution.items():
-                if distribution['morning'] and distribution['afternoon']:
-                    penalty += config.concentration_weight
-
-        return penalty
+        long_counts = np.bincount(teacher_idx[self.task_is_long], minlength=num_teachers)
+        penalty += np.maximum(long_counts - long_counts.mean(), 0).sum() * config.long_exam_weight
+
+        # S-E-04: 午休保障（同一教师同时承担一对午休配对时间段的任务数乘积）
+        if len(self.lunch_pair_first):
+            slot_counts = np.bincount(teacher_idx * self.num_slots + self.task_slot,
+                                      minlength=num_teachers * self.num_slots
+                                      ).reshape(num_teachers, self.num_slots)
+            lunch_pairs = slot_counts[:, self.lunch_pair_first] * slot_counts[:, self.lunch_pair_second]
+            penalty += lunch_pairs.sum() * config.lunch_weight
+
+        # S-E-06: 每日负荷（按 教师×日期 统计任务数）
+        teacher_date = teacher_idx * self.num_dates + self.task_date
+        daily_size = num_teachers * self.num_dates
+        daily_counts = np.bincount(teacher_date, minlength=daily_size)
+        penalty += np.maximum(daily_counts - config.daily_comfort_limit, 0).sum() * config.daily_limit_weight
+
+        # S-E-05: 任务集中度（同一天上下午都有任务）
+        has_morning = np.bincount(teacher_date[self.task_is_morning], minlength=daily_size) > 0
+        has_afternoon = np.bincount(teacher_date[self.task_is_afternoon], minlength=daily_size) > 0
+        penalty += np.count_nonzero(has_morning & has_afternoon) * config.concentration_weight
+
+        return float(penalty)
 
     def _crossover(self, parent1, parent2):
-        """交叉算子"""
-        child1, child2 = [self.toolbox.clone(ind) for ind in (parent1, parent2)]
-
-        # 单点交叉
-        crossover_point = random.randint(1, len(child1) - 1)
-        child1[crossover_point:], child2[crossover_point:] = child2[crossover_point:], child1[crossover_point:]
-
-        return child1, child2
+        """交叉算子（单点交叉，原地交换片段）
+
+        eaSimple在变异前已复制后代，这里无需再次克隆。
+        """
+        if len(parent1) < 2:
+            return parent1, parent2
+        # ndarray切片是视图，需先复制一侧片段再交换（tools.cxOnePoint的元组交换不适用）
+        crossover_point = self.nprng.integers(1, len(parent1))
+        tail = parent1[crossover_point:].copy()
+        parent1[crossover_point:] = parent2[crossover_point:]
+        parent2[crossover_point:] = tail
+        return parent1, parent2
 
     def _mutate(self, individual, indpb):
-        """变异算子"""
-        for i in range(len(individual)):
-            if random.random() < indpb:
-                # 随机变异为另一个教师
-                individual[i] = random.choice([t.id for t in self.schedule.teachers])
+        """变异算子（一次抽取变异掩码，被选中的基因批量替换为随机教师）"""
+        mask = self.nprng.random(len(individual)) < indpb
+        mutate_count = int(np.count_nonzero(mask))
+        if mutate_count and len(self.teacher_ids_arr):
+            individual[mask] = self.nprng.choice(self.teacher_ids_arr, size=mutate_count)
 
         return individual,
 
@@ -377,30 +640,15 @@ class DEAPSolver:
         print("开始运行遗传算法...")
         start_time = time.time()
 
-        # 创建初始种群
-        population = self.toolbox.population(n=self.population_size)
-
-        # 评估初始种群
-        fitnesses = list(map(self.toolbox.evaluate, population))
-        for ind, fit in zip(population, fitnesses):
-            ind.fitness.values = fit
-
-        # 统计信息
-        stats = tools.Statistics(lambda ind: ind.fitness.values)
-        stats.register("min", np.min)
-        stats.register("avg", np.mean)
-        stats.register("max", np.max)
-
-        # 运行遗传算法
-        algorithms.eaSimple(
-            population,
-            self.toolbox,
-            cxpb=0.7,  # 交叉概率
-            mutpb=0.3,  # 变异概率
-            ngen=self.generations,
-            stats=stats,
-            verbose=True
-        )
+        # numba内核可用时启动评估线程池（求解结束后关闭）
+        if _eval_population_kernel is not None and self.n_jobs > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.n_jobs)
+        try:
+            population = self._run_generations()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
 
         self.solve_time = time.time() - start_time
 
@@ -417,6 +665,43 @@ class DEAPSolver:
 
         return len(self.best_assignments) > 0
 
+    def _run_generations(self) -> list:
+        """运行遗传算法主循环，返回最终种群"""
+        # 创建初始种群并批量评估
+        population = self.toolbox.population(n=self.population_size)
+        self._assign_fitness(population)
+
+        # 统计信息
+        stats = tools.Statistics(lambda ind: ind.fitness.values)
+        stats.register("min", np.min)
+        stats.register("avg", np.mean)
+        stats.register("max", np.max)
+
+        logbook = tools.Logbook()
+        logbook.header = ['gen', 'nevals'] + stats.fields
+        record = stats.compile(population)
+        logbook.record(gen=0, nevals=len(population), **record)
+        print(logbook.stream)
+        self.fitness_history = [float(record['min'])]
+
+        # 运行遗传算法（eaSimple主循环，每代未评估的后代整批评估）
+        for gen in range(1, self.generations + 1):
+            offspring = self.toolbox.select(population, len(population))
+            offspring = algorithms.varAnd(offspring, self.toolbox,
+                                          cxpb=0.7,  # 交叉概率
+                                          mutpb=0.3)  # 变异概率
+
+            invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
+            self._assign_fitness(invalid_ind)
+            population[:] = offspring
+
+            record = stats.compile(population)
+            logbook.record(gen=gen, nevals=len(invalid_ind), **record)
+            print(logbook.stream)
+            self.fitness_history.append(float(record['min']))
+
+        return population
+
     def get_schedule(self) -> ExamSchedule:
         """获取求解后的排考安排"""
         result_schedule = ExamSchedule(
@@ -436,21 +721,21 @@ class DEAPSolver:
         print(f"种群大小: {self.population_size}")
         print(f"迭代代数: {self.generations}")
         print(f"求解时间: {self.solve_time:.2f}秒")
-        print(f"最佳适应度: {self.best_individual.fitness.values[0] if self.best_individual else 'N/A'}")
+        print(f"最佳适应度: {self.best_individual.fitness.values[0] if self.best_individual is not None else 'N/A'}")
 
         if self.best_assignments:
             print(f"监考安排数量: {len(self.best_assignments)}")
 
-            # 统计教师安排情况
-            teacher_counts = {}
-            for assignment in self.best_assignments:
-                teacher_id = assignment.teacher.id
-                teacher_counts[teacher_id] = teacher_counts.get(teacher_id, 0) + 1
+            # 统计教师安排情况（bincount计数，只统计有安排的教师）
+            teacher_ids = np.fromiter((a.teacher.id for a in self.best_assignments),
+                                      dtype=np.int64, count=len(self.best_assignments))
+            teacher_counts = np.bincount(teacher_ids)
+            teacher_counts = teacher_counts[teacher_counts > 0]
 
-            if teacher_counts:
-                avg_assignments = sum(teacher_counts.values()) / len(teacher_counts)
-                max_assignments = max(teacher_counts.values())
-                min_assignments = min(teacher_counts.values())
+            if teacher_counts.size:
+                avg_assignments = teacher_counts.mean()
+                max_assignments = int(teacher_counts.max())
+                min_assignments = int(teacher_counts.min())
 
                 print(f"教师平均安排数: {avg_assignments:.2f}")
                 print(f"教师最多安排数: {max_assignments}")
@@ -5,32 +5,71 @@
 功能：根据用户选择的天数和科目，自动生成考试时间安排表
 """
 
-from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
 from typing import List, Dict, Tuple
+import re
 import sys
+from unicodedata import east_asian_width
 
 # 导入新的配置和工具模块
-from config import ExamConfig, get_exam_duration, get_time_slots, calculate_slot_duration
-from utils import TimeUtils
+from config import ExamConfig, get_exam_duration, get_time_slots
+from utils import TimeUtils, WRITE_BUFFER_SIZE
+
+
+# 一天内时间段的排列顺序
+_SLOT_ORDER = ('上午', '下午', '晚上')
+
+# 科目输入分隔符：半角/全角逗号及顿号，连同两侧空白一并切除
+_SUBJECT_SEP = re.compile(r'\s*[,，、]\s*')
+
+
+@lru_cache(maxsize=4096)
+def _visual_len(text: str) -> int:
+    """字符串在终端中的显示宽度（全角/宽字符占2列），按字符串缓存"""
+    return sum(2 if east_asian_width(c) in ('W', 'F') else 1 for c in text)
+
+
+def _pad(text, width: int) -> str:
+    """按显示宽度左对齐补齐空格（替代对中文计数不准的f-string对齐）"""
+    text = str(text)
+    return text + ' ' * (width - _visual_len(text))
+
+
+def _time_to_minutes(time_str: str) -> int:
+    """将'HH:MM'转换为当天的分钟数"""
+    return int(time_str[:2]) * 60 + int(time_str[3:])
+
+
+def _minutes_to_time(minutes: int) -> str:
+    """将当天的分钟数格式化为'HH:MM'"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _slot_minutes(start_str: str, end_str: str) -> Tuple[int, int, int]:
+    """解析时间段边界，返回 (开始分钟, 结束分钟, 可用时长)"""
+    start_m, end_m = _time_to_minutes(start_str), _time_to_minutes(end_str)
+    return start_m, end_m, end_m - start_m
+
 
 class ExamScheduler:
-    def __init__(self):
-        # 使用统一配置（现在从config模块获取）
-        self.EXAM_DURATION = ExamConfig.EXAM_DURATION
-        self.TIME_SLOTS = get_time_slots()
-        self.EXAM_INTERVAL = ExamConfig.EXAM_INTERVAL
+    # 统一配置（从config模块获取），只读常量定义在类上，无需每次实例化时重建
+    EXAM_DURATION = ExamConfig.EXAM_DURATION
+    TIME_SLOTS = get_time_slots()
+    EXAM_INTERVAL = ExamConfig.EXAM_INTERVAL
 
-    def calculate_slot_duration(self, slot_name: str) -> int:
-        """计算时间段可用总时长（分钟）"""
-        return calculate_slot_duration(slot_name)
+    # 时间段边界预先解析为分钟数：{时间段: (开始分钟, 结束分钟, 可用时长)}
+    _SLOT_MINUTES = {slot_name: _slot_minutes(start_str, end_str)
+                     for slot_name, (start_str, end_str) in TIME_SLOTS.items()}
 
-    def time_str_to_datetime(self, time_str: str) -> datetime:
-        """将时间字符串转换为datetime对象"""
-        return datetime.strptime(time_str, '%H:%M')
+    # 可选科目：元组供展示（保持配置顺序），冻结集合供合法性校验
+    _AVAILABLE_SUBJECTS = tuple(EXAM_DURATION)
+    _VALID_SUBJECTS = frozenset(EXAM_DURATION)
 
-    def datetime_to_time_str(self, dt: datetime) -> str:
-        """将datetime对象转换为时间字符串"""
-        return dt.strftime('%H:%M')
+    def calculate_slot_duration(self, slot_name: str) -> int:
+        """计算时间段可用总时长（分钟），未知时间段返回0"""
+        slot = self._SLOT_MINUTES.get(slot_name)
+        return slot[2] if slot else 0
 
     def arrange_exams_in_slot(self, subjects: List[str], slot_name: str, date_str: str) -> List[Dict]:
         """在指定时间段内安排考试"""
@@ -39,16 +78,15 @@ class ExamScheduler:
         if not subjects:
             return arrangements
 
-        start_str, end_str = self.TIME_SLOTS[slot_name]
-        current_time = self.time_str_to_datetime(start_str)
-        end_time = self.time_str_to_datetime(end_str)
+        # 全程使用整数分钟计算，仅在写入结果时格式化为'HH:MM'
+        current_m, end_m, _ = self._SLOT_MINUTES[slot_name]
 
         for subject in subjects:
             duration = self.EXAM_DURATION[subject]
-            exam_end_time = current_time + timedelta(minutes=duration)
+            exam_end_m = current_m + duration
 
             # 检查是否超出时间段
-            if exam_end_time > end_time:
+            if exam_end_m > end_m:
                 print(f"警告：科目 {subject} 无法在 {date_str} {slot_name} 完成安排，时间不足")
                 break
 
@@ -56,53 +94,55 @@ class ExamScheduler:
                 'date': date_str,
                 'time_slot': slot_name,
                 'subject': subject,
-                'start_time': self.datetime_to_time_str(current_time),
-                'end_time': self.datetime_to_time_str(exam_end_time),
+                'start_time': _minutes_to_time(current_m),
+                'end_time': _minutes_to_time(exam_end_m),
                 'duration': duration
             })
 
             # 更新当前时间（加上考试时长和间隔）
-            current_time = exam_end_time + timedelta(minutes=self.EXAM_INTERVAL)
+            current_m = exam_end_m + self.EXAM_INTERVAL
 
         return arrangements
 
-    def get_available_subjects(self) -> List[str]:
-        """获取所有可选科目"""
-        return list(self.EXAM_DURATION.keys())
+    def get_available_subjects(self) -> Tuple[str, ...]:
+        """获取所有可选科目（只读元组，不再每次新建列表）"""
+        return self._AVAILABLE_SUBJECTS
 
     def generate_schedule(self, days: int, daily_subjects: Dict[str, Dict[str, List[str]]]) -> List[Dict]:
         """生成完整考试安排"""
         full_schedule = []
 
-        for day_idx in range(days):
-            date_str = f"第{day_idx + 1}天"
-            if date_str not in daily_subjects:
-                continue
-
-            day_schedule = []
-            for slot_name in ['上午', '下午', '晚上']:
-                if slot_name in daily_subjects[date_str]:
-                    subjects = daily_subjects[date_str][slot_name]
-                    slot_arrangements = self.arrange_exams_in_slot(subjects, slot_name, date_str)
-                    day_schedule.extend(slot_arrangements)
-
-            full_schedule.extend(day_schedule)
+        # daily_subjects按天的顺序构造（第1天、第2天…），直接遍历其条目，取前days天
+        for date_str, slots in islice(daily_subjects.items(), days):
+            for slot_name in _SLOT_ORDER:
+                subjects = slots.get(slot_name)
+                if subjects:
+                    full_schedule.extend(self.arrange_exams_in_slot(subjects, slot_name, date_str))
 
         return full_schedule
 
-    def display_schedule(self, schedule: List[Dict]):
-        """显示考试安排表"""
-        print("\n" + "="*80)
-        print("考试时间安排表".center(80))
-        print("="*80)
-        print(f"{'日期':<8} {'时间段':<8} {'科目':<8} {'开始时间':<10} {'结束时间':<10} {'时长(分钟)':<10}")
-        print("-"*80)
+    def _format_schedule_lines(self, schedule: List[Dict]) -> List[str]:
+        """将考试安排表格式化为文本行（显示与保存共用）"""
+        title = "考试时间安排表"
+        lines = [
+            "="*80,
+            ' ' * ((80 - _visual_len(title)) // 2) + title,
+            "="*80,
+            f"{_pad('日期', 8)} {_pad('时间段', 8)} {_pad('科目', 8)} "
+            f"{_pad('开始时间', 10)} {_pad('结束时间', 10)} {_pad('时长(分钟)', 10)}",
+            "-"*80,
+        ]
+        lines.extend(
+            f"{_pad(exam['date'], 8)} {_pad(exam['time_slot'], 8)} {_pad(exam['subject'], 8)} "
+            f"{_pad(exam['start_time'], 10)} {_pad(exam['end_time'], 10)} {_pad(exam['duration'], 10)}"
+            for exam in schedule
+        )
+        lines.append("="*80)
+        return lines
 
-        for exam in schedule:
-            print(f"{exam['date']:<8} {exam['time_slot']:<8} {exam['subject']:<8} "
-                  f"{exam['start_time']:<10} {exam['end_time']:<10} {exam['duration']:<10}")
-
-        print("="*80)
+    def display_schedule(self, schedule: List[Dict]):
+        """显示考试安排表（拼接后一次输出）"""
+        print("\n" + "\n".join(self._format_schedule_lines(schedule)))
 
     def interactive_mode(self):
         """交互式模式"""
@@ -132,7 +172,7 @@ class ExamScheduler:
 
             print(f"\n=== {date_str} ===")
 
-            for slot_name in ['上午', '下午', '晚上']:
+            for slot_name in _SLOT_ORDER:
                 print(f"\n{slot_name}时间段（可用时长：{self.calculate_slot_duration(slot_name)}分钟）")
 
                 while True:
@@ -142,16 +182,17 @@ class ExamScheduler:
                         daily_subjects[date_str][slot_name] = []
                         break
 
-                    subjects = [s.strip() for s in subject_input.split(',') if s.strip()]
+                    subjects = [s for s in _SUBJECT_SEP.split(subject_input) if s]
 
-                    # 验证科目
-                    invalid_subjects = [s for s in subjects if s not in self.EXAM_DURATION]
-                    if invalid_subjects:
+                    # 验证科目（集合差一次求出全部无效科目，报错时按输入顺序列出）
+                    invalid = set(subjects) - self._VALID_SUBJECTS
+                    if invalid:
+                        invalid_subjects = [s for s in subjects if s in invalid]
                         print(f"无效科目：{', '.join(invalid_subjects)}，请重新输入")
                         continue
 
                     # 检查时间是否足够
-                    total_duration = sum(self.EXAM_DURATION[s] for s in subjects)
+                    total_duration = sum(map(self.EXAM_DURATION.__getitem__, subjects))
                     total_time = total_duration + (len(subjects) - 1) * self.EXAM_INTERVAL
                     available_time = self.calculate_slot_duration(slot_name)
 
@@ -178,18 +219,9 @@ class ExamScheduler:
             os.makedirs("process_data", exist_ok=True)
             filename = os.path.join("process_data", "考试安排表.txt")
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write("="*80 + "\n")
-                f.write("考试时间安排表\n".center(80))
-                f.write("="*80 + "\n")
-                f.write(f"{'日期':<8} {'时间段':<8} {'科目':<8} {'开始时间':<10} {'结束时间':<10} {'时长(分钟)':<10}\n")
-                f.write("-"*80 + "\n")
-
-                for exam in schedule:
-                    f.write(f"{exam['date']:<8} {exam['time_slot']:<8} {exam['subject']:<8} "
-                           f"{exam['start_time']:<10} {exam['end_time']:<10} {exam['duration']:<10}\n")
-
-                f.write("="*80 + "\n")
+            content = "\n".join(self._format_schedule_lines(schedule)) + "\n"
+            with open(filename, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                f.write(content)
 
             print(f"安排表已保存到 {filename}")
         except Exception as e:
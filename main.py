@@ -3,42 +3,106 @@
 整合OR-Tools和DEAP两种算法，提供完整的排考解决方案
 """
 import argparse
+import logging
+import os
+import queue
 import sys
 import time
-from typing import Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from multiprocessing import get_context
+from typing import Dict, Any, List, Optional, Tuple
 
 from data_generator import DataGenerator
 from ortools_solver import ORToolsSolver
 from deap_solver import DEAPSolver
 from visualization import ResultVisualizer
-from models import SubjectType, ConstraintConfig
+from models import SubjectType, ConstraintConfig, Assignment, ExamSchedule
+
+
+# 基准测试进度日志（经队列由后台线程写出，不阻塞求解）
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _benchmark_log_output(asynchronous: bool = False):
+    """在上下文内将logger的记录写到stdout，退出时恢复logger原有的级别与传播设置
+
+    asynchronous为True时记录经QueueHandler入队，由QueueListener后台线程写出，
+    退出时停止监听线程，保证队列中剩余记录全部输出。只适用于期间没有其他print
+    输出的场景（并行基准测试的主进程）；否则记录与求解过程的print会乱序，
+    因此串行路径与进程池单元内同步写出。
+    """
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    if asynchronous:
+        log_queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, stream_handler)
+        handler = QueueHandler(log_queue)
+    else:
+        listener = None
+        handler = stream_handler
+
+    saved_level, saved_propagate = logger.level, logger.propagate
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if listener is not None:
+        listener.start()
+    try:
+        yield
+    finally:
+        if listener is not None:
+            listener.stop()
+        logger.removeHandler(handler)
+        logger.setLevel(saved_level)
+        logger.propagate = saved_propagate
 
 
 class IntelligentExamScheduler:
     """智能排考系统主类"""
 
-    def __init__(self):
-        self.generator = DataGenerator(seed=42)
+    # 可缓存的标准数据规模（每个规模用同一种子新建生成器，数据与生成顺序无关，可重复使用）
+    CACHEABLE_SIZES = ('small', 'medium', 'large')
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+        self.generator = DataGenerator(seed=seed)
         self.schedule = None
+        # 测试数据缓存：{规模: ExamSchedule}，多次基准测试间复用
+        self._data_cache: Dict[str, ExamSchedule] = {}
         self.result_schedule = None
         self.solve_time = 0
         self.algorithm_used = ""
+        # 统计结果缓存：(对应的result_schedule, generate_statistics()结果)
+        self._stats_cache = (None, None)
+        # 问题规模缓存：(对应的schedule, 教师数, 监考任务数)
+        self._size_cache = (None, 0, 0)
 
     def generate_test_data(self, size: str = "small", custom_config: Optional[Dict] = None):
         """生成测试数据"""
         print(f"生成{size}规模测试数据...")
 
-        if size == "small":
-            self.schedule = self.generator.create_small_test_case()
-        elif size == "medium":
-            self.schedule = self.generator.create_medium_test_case()
-        elif size == "large":
-            self.schedule = self.generator.create_large_test_case()
+        # 标准规模优先复用缓存，自定义配置不走缓存
+        cacheable = size in self.CACHEABLE_SIZES and not custom_config
+        cached = self._data_cache.get(size) if cacheable else None
+
+        if cached is not None:
+            print("  使用缓存数据")
+            self.schedule = cached
+        elif size in self.CACHEABLE_SIZES:
+            # 标准规模每次用新的同种子生成器，结果不受之前生成过哪些数据影响
+            generator = DataGenerator(seed=self.seed)
+            self.schedule = getattr(generator, f"create_{size}_test_case")()
         elif size == "custom" and custom_config:
             self.schedule = self._generate_custom_data(custom_config)
         else:
             raise ValueError(f"不支持的数据规模: {size}")
 
+        if cacheable and cached is None:
+            self._data_cache[size] = self.schedule
+
         # 应用自定义配置
         if custom_config and 'constraint_config' in custom_config:
             self.schedule.config = custom_config['constraint_config']
@@ -48,7 +112,17 @@ class IntelligentExamScheduler:
         print(f"  考场数量: {len(self.schedule.rooms)}")
         print(f"  时间段数量: {len(self.schedule.time_slots)}")
         print(f"  考试数量: {len(self.schedule.exams)}")
-        print(f"  总监考任务数: {sum(exam.get_total_rooms() for exam in self.schedule.exams)}")
+        print(f"  总监考任务数: {self._problem_size()[1]}")
+
+    def _problem_size(self) -> Tuple[int, int]:
+        """获取当前数据的问题规模 (教师数, 总监考任务数)，同一份数据只统计一次
+
+        以schedule对象本身作为缓存键，外部直接替换self.schedule时会重新统计。
+        """
+        if self._size_cache[0] is not self.schedule:
+            self._size_cache = (self.schedule, len(self.schedule.teachers),
+                                self.schedule.get_total_tasks())
+        return self._size_cache[1], self._size_cache[2]
 
     def _generate_custom_data(self, config: Dict):
         """生成自定义数据"""
@@ -62,28 +136,40 @@ class IntelligentExamScheduler:
             rooms_per_exam=rooms_per_exam
         )
 
-    def solve_with_ortools(self, time_limit: int = 60) -> bool:
-        """使用OR-Tools求解"""
+    def solve_with_ortools(self, time_limit: int = 60, num_workers: Optional[int] = None,
+                           warm_start: bool = True) -> bool:
+        """使用OR-Tools求解
+
+        num_workers为CP-SAT搜索线程数（None时使用求解器默认值）；
+        warm_start为True时以贪心解作为求解提示。
+        """
         print("\n=== 使用OR-Tools求解 ===")
 
         try:
-            solver = ORToolsSolver(self.schedule)
+            solver = ORToolsSolver(self.schedule, cpu_budget=num_workers)
             solver.solver.parameters.max_time_in_seconds = time_limit
 
             # 构建模型
-            build_start = time.time()
+            build_start = time.perf_counter()
             solver.build_model()
-            build_time = time.time() - build_start
+            build_time = time.perf_counter() - build_start
             print(f"模型构建时间: {build_time:.2f}秒")
 
+            # 贪心解作为初始提示
+            if warm_start:
+                hint = self._build_hint()
+                solver.add_hint_from(hint)
+                print(f"已添加贪心初始解提示: {len(hint)} 个监考安排")
+
             # 求解
-            solve_start = time.time()
+            solve_start = time.perf_counter()
             success = solver.solve()
-            self.solve_time = time.time() - solve_start
+            self.solve_time = time.perf_counter() - solve_start
 
             if success:
                 self.result_schedule = solver.get_schedule()
                 self.algorithm_used = "OR-Tools"
+                self._stats_cache = (None, None)
 
                 solver.print_solution_stats()
                 return True
@@ -98,21 +184,62 @@ class IntelligentExamScheduler:
             print(f"OR-Tools求解出错: {e}")
             return False
 
-    def solve_with_deap(self, population_size: int = 200, generations: int = 100) -> bool:
-        """使用DEAP遗传算法求解"""
+    def _build_hint(self) -> List[Assignment]:
+        """贪心构造一个监考安排，作为OR-Tools的初始解提示
+
+        按考试顺序为每个考场选择当前加权总负荷最低的可用教师
+        （回避本学科、避开请假时段、同一时间段不重复安排）。
+        """
+        config = self.schedule.config
+        # 教师当前的加权总负荷（初始只有历史负荷部分）
+        weighted_load = {t.id: config.historical_weight * t.historical_load
+                         for t in self.schedule.teachers}
+        used_by_slot: Dict[str, set] = {}  # 各时间段已安排的教师ID
+        hint = []
+
+        for exam in self.schedule.exams:
+            time_slot = exam.time_slot
+            candidates = [
+                t for t in self.schedule.teachers
+                if t.subject != exam.subject and not any(
+                    leave_date == time_slot.date and leave_slot in time_slot.name
+                    for leave_date, leave_slot in t.leave_times)
+            ]
+            used = used_by_slot.setdefault(time_slot.id, set())
+            load_delta = config.current_weight * time_slot.duration_minutes * config.invigilation_coefficient
+
+            for room in exam.rooms:
+                available = [t for t in candidates if t.id not in used]
+                if not available:
+                    break
+                teacher = min(available, key=lambda t: weighted_load[t.id])
+                used.add(teacher.id)
+                weighted_load[teacher.id] += load_delta
+                hint.append(Assignment(teacher=teacher, room=room, time_slot=time_slot,
+                                       subject=exam.subject))
+
+        return hint
+
+    def solve_with_deap(self, population_size: int = 200, generations: int = 100,
+                        n_jobs: Optional[int] = None) -> bool:
+        """使用DEAP遗传算法求解
+
+        n_jobs为适应度并行评估的线程数（None时使用求解器默认值，即CPU核数）。
+        """
         print("\n=== 使用DEAP遗传算法求解 ===")
 
         try:
-            solver = DEAPSolver(self.schedule, population_size, generations)
+            solver = DEAPSolver(self.schedule, population_size, generations, n_jobs=n_jobs)
 
             # 求解
-            solve_start = time.time()
+            solve_start = time.perf_counter()
             success = solver.solve()
-            self.solve_time = solve_start - solve_start
+            self.solve_time = time.perf_counter() - solve_start
 
             if success:
                 self.result_schedule = solver.get_schedule()
                 self.algorithm_used = "DEAP"
+                self._stats_cache = (None, None)
 
                 solver.print_solution_stats()
                 return True
@@ -132,8 +259,7 @@ class IntelligentExamScheduler:
         print("\n=== 自动算法选择求解 ===")
 
         # 对于小规模问题，优先使用OR-Tools
-        total_tasks = sum(exam.get_total_rooms() for exam in self.schedule.exams)
-        teacher_count = len(self.schedule.teachers)
+        teacher_count, total_tasks = self._problem_size()
 
         print(f"问题规模: {teacher_count}名教师, {total_tasks}个监考任务")
 
@@ -147,6 +273,12 @@ class IntelligentExamScheduler:
         print("使用DEAP遗传算法求解...")
         return self.solve_with_deap(deap_population, deap_generations)
 
+    def _stats(self) -> Dict[str, Any]:
+        """获取当前求解结果的统计信息（同一结果只计算一次）"""
+        if self._stats_cache[0] is not self.result_schedule:
+            self._stats_cache = (self.result_schedule, self.result_schedule.generate_statistics())
+        return self._stats_cache[1]
+
     def analyze_result(self):
         """分析求解结果"""
         if not self.result_schedule:
@@ -158,7 +290,7 @@ class IntelligentExamScheduler:
         print("="*50)
 
         # 生成统计信息
-        stats = self.result_schedule.generate_statistics()
+        stats = self._stats()
 
         # 基本信息
         print(f"\n📊 基本信息:")
@@ -192,86 +324,149 @@ class IntelligentExamScheduler:
         # 负荷分布
         teacher_stats = stats.get('teacher_stats', [])
         if teacher_stats:
-            loads = [stat['total_weighted_load'] for stat in teacher_stats]
+            # 一次遍历同时找出负荷最大与最小的教师
+            max_stat = min_stat = teacher_stats[0]
+            max_load = min_load = max_stat['total_weighted_load']
+            for stat in teacher_stats[1:]:
+                load = stat['total_weighted_load']
+                if load > max_load:
+                    max_stat, max_load = stat, load
+                elif load < min_load:
+                    min_stat, min_load = stat, load
+
             print(f"\n📈 负荷分布:")
             print(f"  教师平均安排数: {len(self.result_schedule.assignments) / len(teacher_stats):.2f}")
-            print(f"  负荷最大教师: {max(teacher_stats, key=lambda x: x['total_weighted_load'])['teacher_name']} "
-                  f"({max(loads):.2f})")
-            print(f"  负荷最小教师: {min(teacher_stats, key=lambda x: x['total_weighted_load'])['teacher_name']} "
-                  f"({min(loads):.2f})")
+            print(f"  负荷最大教师: {max_stat['teacher_name']} ({max_load:.2f})")
+            print(f"  负荷最小教师: {min_stat['teacher_name']} ({min_load:.2f})")
 
 
-    def run_benchmark(self, sizes: list = None, algorithms: list = None):
-        """运行基准测试"""
+    def run_benchmark(self, sizes: list = None, algorithms: list = None, n_jobs: int = 1):
+        """运行基准测试
+
+        默认在当前进程内串行运行，计时可与历史结果直接比较。各(规模, 算法)测试单元相互独立，
+        n_jobs>1时分发到进程池并行运行；此时各单元争用CPU，耗时只适合相互比较。
+        """
         if sizes is None:
             sizes = ['small', 'medium', 'large']
         if algorithms is None:
             algorithms = ['ortools', 'deap']
 
-        print("\n" + "="*60)
-        print("智能排考系统基准测试")
-        print("="*60)
-
-        results = {}
-
-        for size in sizes:
-            print(f"\n--- {size.upper()} 规模测试 ---")
-            results[size] = {}
-
-            # 生成测试数据
-            self.generate_test_data(size)
+        n_jobs = max(1, min(len(sizes) * len(algorithms), n_jobs))
+
+        # 并行时主进程只输出进度标题与汇总，可异步写出；串行时与求解过程的print同步输出，保证顺序
+        with _benchmark_log_output(asynchronous=n_jobs > 1):
+            self._run_benchmark(sizes, algorithms, n_jobs)
+
+    def _run_benchmark(self, sizes: list, algorithms: list, n_jobs: int):
+        """运行基准测试主体"""
+        logger.info("\n" + "="*60)
+        logger.info("智能排考系统基准测试")
+        logger.info("="*60)
+
+        results = {size: {} for size in sizes}
+        cells = [(size, algorithm) for size in sizes for algorithm in algorithms]
+
+        if n_jobs > 1:
+            # 每个进程内求解器（OR-Tools搜索线程、DEAP评估线程）按并行单元数均分CPU，避免超额订阅
+            cpu_share = max(1, (os.cpu_count() or 1) // n_jobs)
+            logger.info("并行运行 %d 个测试单元（%d 个进程）...", len(cells), n_jobs)
+            # spawn启动子进程：不继承主进程的日志队列处理器与监听线程状态
+            with ProcessPoolExecutor(max_workers=n_jobs, mp_context=get_context('spawn')) as executor:
+                futures = [executor.submit(_run_benchmark_cell, size, algorithm, cpu_share)
+                           for size, algorithm in cells]
+                for (size, algorithm), future in zip(cells, futures):
+                    result, schedule, result_schedule, solve_time, algorithm_used = future.result()
+                    # 按单元顺序回写实例状态，与串行运行结束后一致
+                    self.schedule = self._data_cache.setdefault(size, schedule)
+                    if result is None:
+                        continue
+                    self.solve_time = solve_time
+                    if result_schedule is not None:
+                        self.result_schedule = result_schedule
+                        self.algorithm_used = algorithm_used
+                        self._stats_cache = (None, None)
+                    results[size][algorithm] = result
+        else:
+            for size in sizes:
+                logger.info("\n--- %s 规模测试 ---", size.upper())
 
-            # 测试各个算法
-            for algorithm in algorithms:
-                print(f"\n测试 {algorithm.upper()}:")
+                # 生成测试数据
+                self.generate_test_data(size)
 
-                if algorithm == 'ortools':
-                    time_limit = 60 if size == 'large' else 30
-                    success = self.solve_with_ortools(time_limit)
-                elif algorithm == 'deap':
-                    pop_size = 100 if size == 'large' else 200
-                    generations = 50 if size == 'large' else 100
-                    success = self.solve_with_deap(pop_size, generations)
-                else:
-                    continue
-
-                if success:
-                    stats = self.result_schedule.generate_statistics()
-                    fairness_metrics = stats.get('fairness_metrics', {})
-                    conflicts = stats.get('constraint_stats', {}).get('conflicts', [])
-
-                    results[size][algorithm] = {
-                        'success': True,
-                        'time': self.solve_time,
-                        'objective': getattr(self.result_schedule, 'objective_value', 0),
-                        'conflicts': len(conflicts),
-                        'load_range': fairness_metrics.get('load_range', 0),
-                        'assignments': len(self.result_schedule.assignments)
-                    }
-
-                    print(f"  ✅ 成功 - 耗时: {self.solve_time:.2f}s, 冲突: {len(conflicts)}, "
-                          f"负荷极差: {fairness_metrics.get('load_range', 0):.2f}")
-                else:
-                    results[size][algorithm] = {'success': False, 'time': self.solve_time}
-                    print(f"  ❌ 失败 - 耗时: {self.solve_time:.2f}s")
+                # 测试各个算法
+                for algorithm in algorithms:
+                    result = self._benchmark_algorithm(size, algorithm)
+                    if result is not None:
+                        results[size][algorithm] = result
 
         # 输出汇总结果
         self._print_benchmark_summary(results)
 
+    def _benchmark_algorithm(self, size: str, algorithm: str,
+                             cpu_share: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """在当前数据上运行单个算法的基准测试，返回结果字典（不支持的算法返回None）
+
+        cpu_share为求解器可用的线程数（None时使用各求解器的默认值）。
+        """
+        logger.info("\n测试 %s:", algorithm.upper())
+
+        if algorithm == 'ortools':
+            time_limit = 60 if size == 'large' else 30
+            success = self.solve_with_ortools(time_limit, num_workers=cpu_share)
+        elif algorithm == 'deap':
+            pop_size = 100 if size == 'large' else 200
+            generations = 50 if size == 'large' else 100
+            success = self.solve_with_deap(pop_size, generations, n_jobs=cpu_share)
+        else:
+            return None
+
+        if success:
+            stats = self._stats()
+            fairness_metrics = stats.get('fairness_metrics', {})
+            conflicts = stats.get('constraint_stats', {}).get('conflicts', [])
+
+            logger.info("  ✅ 成功 - 耗时: %.2fs, 冲突: %d, 负荷极差: %.2f",
+                        self.solve_time, len(conflicts), fairness_metrics.get('load_range', 0))
+            return {
+                'success': True,
+                'time': self.solve_time,
+                'objective': getattr(self.result_schedule, 'objective_value', 0),
+                'conflicts': len(conflicts),
+                'load_range': fairness_metrics.get('load_range', 0),
+                'assignments': len(self.result_schedule.assignments)
+            }
+
+        logger.info("  ❌ 失败 - 耗时: %.2fs", self.solve_time)
+        return {'success': False, 'time': self.solve_time}
+
     def _print_benchmark_summary(self, results: Dict):
         """打印基准测试汇总"""
-        print("\n" + "="*40)
-        print("基准测试汇总")
-        print("="*40)
+        logger.info("\n" + "="*40)
+        logger.info("基准测试汇总")
+        logger.info("="*40)
 
         for size, size_results in results.items():
-            print(f"\n{size.upper()} 规模:")
+            logger.info("\n%s 规模:", size.upper())
             for algorithm, result in size_results.items():
                 if result['success']:
-                    print(f"  {algorithm.upper()}: ✅ {result['time']:.2f}s | "
-                          f"冲突:{result['conflicts']} | 极差:{result['load_range']:.2f}")
+                    logger.info("  %s: ✅ %.2fs | 冲突:%d | 极差:%.2f", algorithm.upper(),
+                                result['time'], result['conflicts'], result['load_range'])
                 else:
-                    print(f"  {algorithm.upper()}: ❌ {result['time']:.2f}s")
+                    logger.info("  %s: ❌ %.2fs", algorithm.upper(), result['time'])
+
+
+def _run_benchmark_cell(size: str, algorithm: str, cpu_share: Optional[int] = None
+                        ) -> Tuple[Optional[Dict[str, Any]], ExamSchedule, Optional[ExamSchedule], float, str]:
+    """进程池中运行单个基准测试单元：独立生成该规模数据并求解
+
+    返回(结果字典, 测试数据, 求解结果, 求解耗时, 所用算法)，供主进程回写实例状态。
+    """
+    with _benchmark_log_output():
+        scheduler = IntelligentExamScheduler()
+        scheduler.generate_test_data(size)
+        result = scheduler._benchmark_algorithm(size, algorithm, cpu_share)
+        return (result, scheduler.schedule, scheduler.result_schedule,
+                scheduler.solve_time, scheduler.algorithm_used)
 
 
 def main():
@@ -2,10 +2,18 @@
 核心数据模型定义
 智能排考系统的基础数据结构
 """
+import sys
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import List, Dict, Set, Tuple, Optional
+from typing import List, Dict, Set, FrozenSet, Iterator, Tuple, Optional
 from datetime import datetime, timedelta
 from enum import Enum
+from operator import attrgetter
+
+import numpy as np
+
+# 大批量创建的模型使用__slots__（省去实例__dict__），dataclass的slots参数需Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 
 class ExamMode(Enum):
@@ -28,9 +36,18 @@ class SubjectType(Enum):
     SCIENCE = "科学"
 
 
-@dataclass
+_get_id = attrgetter('id')
+
+# 科目 -> 整数编号（列式存储中以小整数代替枚举对象）
+_SUBJECT_INDEX = {subject: i for i, subject in enumerate(SubjectType)}
+
+# 科目 -> 显示名称（Enum.value为描述符属性，批量生成报表时预先取出）
+_SUBJECT_LABELS = {subject: subject.value for subject in SubjectType}
+
+
+@dataclass(eq=False, **_SLOTS)
 class Teacher:
-    """教师类"""
+    """教师类（相等性与哈希只看id）"""
     id: int
     name: str
     subject: SubjectType
@@ -49,11 +66,16 @@ class Teacher:
     total_weighted_load: float = 0.0  # 加权总负荷
     long_exam_count: int = 0  # 长时科目监考次数
 
+    def __eq__(self, other):
+        if not isinstance(other, Teacher):
+            return NotImplemented
+        return self.id == other.id
+
     def __hash__(self):
         return hash(self.id)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Room:
     """考场类"""
     id: int
@@ -63,9 +85,9 @@ class Room:
     floor: str = ""
 
 
-@dataclass
+@dataclass(eq=False, **_SLOTS)
 class TimeSlot:
-    """时间段类"""
+    """时间段类（相等性与哈希只看id）"""
     id: str
     name: str
     date: str
@@ -78,11 +100,16 @@ class TimeSlot:
     is_afternoon: bool = False
     is_lunch_pair_with: Optional[str] = None  # 午休配对的时间段ID
 
+    def __eq__(self, other):
+        if not isinstance(other, TimeSlot):
+            return NotImplemented
+        return self.id == other.id
+
     def __hash__(self):
         return hash(self.id)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Exam:
     """考试类"""
     subject: SubjectType
@@ -95,15 +122,21 @@ class Exam:
         return len(self.rooms)
 
 
-@dataclass
+@dataclass(eq=False, **_SLOTS)
 class Assignment:
-    """监考安排类"""
+    """监考安排类（相等性与哈希只看 教师id, 考场id, 时间段id）"""
     teacher: Teacher
     room: Room
     time_slot: TimeSlot
     subject: SubjectType
     is_invigilation: bool = True  # True: 监考, False: 自习坐班
 
+    def __eq__(self, other):
+        if not isinstance(other, Assignment):
+            return NotImplemented
+        return (self.teacher.id == other.teacher.id and self.room.id == other.room.id and
+                self.time_slot.id == other.time_slot.id)
+
     def __hash__(self):
         return hash((self.teacher.id, self.room.id, self.time_slot.id))
 
@@ -131,6 +164,99 @@ class ConstraintConfig:
     lunch_break_duration: int = 90        # 午休时间(分钟)
 
 
+def _teacher_loads(offsets, durations, is_invig, is_long, inv_coef, study_coef):
+    """一次算出全部教师的 (本次负荷, 长时科目监考次数)
+
+    offsets[t]:offsets[t+1] 为第t名教师的安排区间；bincount按输入顺序累加，结果与逐条累加一致。
+    """
+    num_teachers = offsets.shape[0] - 1
+    owner = np.repeat(np.arange(num_teachers), np.diff(offsets))
+    weighted = durations * np.where(is_invig, inv_coef, study_coef)
+    loads = np.bincount(owner, weights=weighted, minlength=num_teachers)
+    long_counts = np.bincount(owner[is_invig & is_long], minlength=num_teachers)
+    return loads, long_counts
+
+
+def _group_rows(owner_pos: np.ndarray, num_owners: int) -> Tuple[np.ndarray, np.ndarray]:
+    """按所属对象位置分组行号：返回 (行号排列, CSR偏移)，位置<0的行被丢弃
+
+    稳定排序保持同一对象内的原有顺序。
+    """
+    known = np.flatnonzero(owner_pos >= 0)
+    order = known[np.argsort(owner_pos[known], kind='stable')]
+    offsets = np.zeros(num_owners + 1, dtype=np.int64)
+    np.cumsum(np.bincount(owner_pos[known], minlength=num_owners), out=offsets[1:])
+    return order, offsets
+
+
+def _duplicate_pairs(owner_pos: np.ndarray, slot_idx: np.ndarray,
+                     num_owners: int, num_slots: int) -> List[Tuple[int, int, int]]:
+    """找出同一对象（位置>=0）在同一时间段出现多次的 (对象位置, 时间段编号, 次数)
+
+    用定长计数数组（对象数×时间段数）一次bincount完成计数；
+    结果按对象位置排列，同一对象内按时间段首次出现的顺序排列。
+    """
+    known = np.flatnonzero(owner_pos >= 0)
+    keys = owner_pos[known] * num_slots + slot_idx[known]
+    counts = np.bincount(keys, minlength=num_owners * num_slots)
+
+    dup_keys = keys[counts[keys] > 1]
+    if dup_keys.size == 0:
+        return []
+    # 每个重复键只保留首次出现，再按对象位置稳定排序
+    _, first = np.unique(dup_keys, return_index=True)
+    dup_keys = dup_keys[np.sort(first)]
+    dup_keys = dup_keys[np.argsort(dup_keys // num_slots, kind='stable')]
+    return [(key // num_slots, key % num_slots, int(counts[key])) for key in dup_keys.tolist()]
+
+
+@dataclass
+class AssignmentTable:
+    """监考安排的列式镜像（只读，由ExamSchedule按需构建，assignments列表仍为数据来源）
+
+    每列第k项对应assignments[k]；教师/考场记为在teachers/rooms中的位置（不在其中为-1），
+    时间段id驻留为整数编号（与ExamSchedule.time_slot_index一致，slot_ids[编号]为原id），
+    科目记为_SUBJECT_INDEX编号。
+    """
+    teacher_pos: np.ndarray
+    room_pos: np.ndarray
+    slot_idx: np.ndarray
+    subject_idx: np.ndarray
+    durations: np.ndarray
+    is_invig: np.ndarray
+    slot_ids: List[str]
+
+    def __len__(self) -> int:
+        return self.teacher_pos.shape[0]
+
+    @classmethod
+    def build(cls, assignments: List[Assignment], teachers: List[Teacher],
+              rooms: List[Room], time_slot_index: Dict[str, int]) -> 'AssignmentTable':
+        """单次遍历assignments构建各列（不在time_slot_index中的时间段依次追加编号）"""
+        teacher_pos_get = {t.id: i for i, t in enumerate(teachers)}.get
+        room_pos_get = {r.id: i for i, r in enumerate(rooms)}.get
+        slot_index = dict(time_slot_index)
+
+        n = len(assignments)
+        teacher_pos = np.empty(n, dtype=np.int64)
+        room_pos = np.empty(n, dtype=np.int64)
+        slot_idx = np.empty(n, dtype=np.int64)
+        subject_idx = np.empty(n, dtype=np.int8)
+        durations = np.empty(n, dtype=np.float64)
+        is_invig = np.empty(n, dtype=np.bool_)
+        for k, assignment in enumerate(assignments):
+            time_slot = assignment.time_slot
+            teacher_pos[k] = teacher_pos_get(assignment.teacher.id, -1)
+            room_pos[k] = room_pos_get(assignment.room.id, -1)
+            slot_idx[k] = slot_index.setdefault(time_slot.id, len(slot_index))
+            subject_idx[k] = _SUBJECT_INDEX[assignment.subject]
+            durations[k] = time_slot.duration_minutes
+            is_invig[k] = assignment.is_invigilation
+
+        return cls(teacher_pos, room_pos, slot_idx, subject_idx, durations, is_invig,
+                   list(slot_index))
+
+
 @dataclass
 class ExamSchedule:
     """考试安排总表"""
@@ -145,72 +271,171 @@ class ExamSchedule:
     teacher_map: Dict[int, Teacher] = field(default_factory=dict)
     room_map: Dict[int, Room] = field(default_factory=dict)
     time_slot_map: Dict[str, TimeSlot] = field(default_factory=dict)
+    # 时间段id驻留表 {时间段id: 整数编号}，编号按time_slots顺序从0连续分配
+    time_slot_index: Dict[str, int] = field(default_factory=dict)
+
+    # 安排索引：按教师/考场/时间段分组的安排列表（惰性构建，见_ensure_indexes）
+    _by_teacher: Dict[int, List[Assignment]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_room: Dict[int, List[Assignment]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_time_slot: Dict[str, List[Assignment]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _indexed_assignments: Optional[List[Assignment]] = field(default=None, init=False, repr=False, compare=False)
+    _indexed_count: int = field(default=-1, init=False, repr=False, compare=False)
+    # 考试索引缓存：(构建时的exams列表, 列表长度, {科目: 该科目的考试}, 长时科目集合)
+    _exam_index_cache: Optional[Tuple[List[Exam], int, Dict[SubjectType, Tuple[Exam, ...]],
+                                      FrozenSet[SubjectType]]] = field(
+        default=None, init=False, repr=False, compare=False)
+    # 教师负荷缓存 {教师id: (计算所依据的负荷系数、历史负荷与长时科目集合, _teacher_load_stats结果)}，
+    # 随安排增删按教师失效；索引重建时整体清空；系数、历史负荷或长时科目变化时按键比对失效
+    _load_cache: Dict[int, Tuple[Tuple, Tuple[float, float, float, int]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    # 列式安排表缓存：((assignments, teachers, rooms), 三者长度, 列式表)
+    _table_cache: Optional[Tuple[Tuple, Tuple[int, int, int], AssignmentTable]] = field(
+        default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        """初始化索引映射"""
-        self.teacher_map = {t.id: t for t in self.teachers}
-        self.room_map = {r.id: r for r in self.rooms}
-        self.time_slot_map = {ts.id: ts for ts in self.time_slots}
+        """初始化索引映射（id取值交给C实现的attrgetter，避免逐个对象执行Python字节码）"""
+        self.teacher_map = dict(zip(map(_get_id, self.teachers), self.teachers))
+        self.room_map = dict(zip(map(_get_id, self.rooms), self.rooms))
+        self.time_slot_map = dict(zip(map(_get_id, self.time_slots), self.time_slots))
+        # 字典键保持首次出现的顺序，按该顺序为去重后的时间段id编号
+        self.time_slot_index = dict(zip(self.time_slot_map, range(len(self.time_slot_map))))
+
+    def _ensure_indexes(self):
+        """确保安排索引与assignments一致
+
+        assignments列表被整体替换或长度发生变化（如外部直接append）时重建索引；
+        原地替换列表元素后需调用invalidate_cache()。
+        """
+        if (self._indexed_assignments is self.assignments and
+                self._indexed_count == len(self.assignments)):
+            return
+
+        by_teacher = defaultdict(list)
+        by_room = defaultdict(list)
+        by_time_slot = defaultdict(list)
+        for assignment in self.assignments:
+            by_teacher[assignment.teacher.id].append(assignment)
+            by_room[assignment.room.id].append(assignment)
+            by_time_slot[assignment.time_slot.id].append(assignment)
+
+        self._by_teacher = dict(by_teacher)
+        self._by_room = dict(by_room)
+        self._by_time_slot = dict(by_time_slot)
+        self._load_cache = {}
+        self._indexed_assignments = self.assignments
+        self._indexed_count = len(self.assignments)
+
+    def invalidate_cache(self):
+        """丢弃所有派生缓存，下次访问时按当前数据重建"""
+        self._indexed_assignments = None
+        self._exam_index_cache = None
+        self._table_cache = None
+        self._load_cache = {}
+
+    def add_assignment(self, assignment: Assignment):
+        """添加监考安排并同步更新索引"""
+        self._ensure_indexes()
+        self.assignments.append(assignment)
+        self._by_teacher.setdefault(assignment.teacher.id, []).append(assignment)
+        self._by_room.setdefault(assignment.room.id, []).append(assignment)
+        self._by_time_slot.setdefault(assignment.time_slot.id, []).append(assignment)
+        self._indexed_count += 1
+        self._load_cache.pop(assignment.teacher.id, None)
+
+    def remove_assignment(self, assignment: Assignment):
+        """移除监考安排并同步更新索引（安排不存在时抛出ValueError）"""
+        self._ensure_indexes()
+        self.assignments.remove(assignment)
+        self._by_teacher[assignment.teacher.id].remove(assignment)
+        self._by_room[assignment.room.id].remove(assignment)
+        self._by_time_slot[assignment.time_slot.id].remove(assignment)
+        self._indexed_count -= 1
+        self._load_cache.pop(assignment.teacher.id, None)
+
+    def get_total_tasks(self) -> int:
+        """获取监考任务总数（全部考试的考场数之和）"""
+        return sum(len(exam.rooms) for exam in self.exams)
+
+    def iter_teacher_assignments(self, teacher_id: int) -> Iterator[Assignment]:
+        """遍历某个教师的监考安排（直接迭代索引不复制列表，遍历期间不可增删安排）"""
+        self._ensure_indexes()
+        return iter(self._by_teacher.get(teacher_id, ()))
+
+    def iter_room_assignments(self, room_id: int) -> Iterator[Assignment]:
+        """遍历某个考场的监考安排（直接迭代索引不复制列表，遍历期间不可增删安排）"""
+        self._ensure_indexes()
+        return iter(self._by_room.get(room_id, ()))
+
+    def iter_time_slot_assignments(self, time_slot_id: str) -> Iterator[Assignment]:
+        """遍历某个时间段的监考安排（直接迭代索引不复制列表，遍历期间不可增删安排）"""
+        self._ensure_indexes()
+        return iter(self._by_time_slot.get(time_slot_id, ()))
 
     def get_teacher_assignments(self, teacher_id: int) -> List[Assignment]:
         """获取某个教师的所有监考安排"""
-        return [a for a in self.assignments if a.teacher.id == teacher_id]
+        return list(self.iter_teacher_assignments(teacher_id))
 
     def get_room_assignments(self, room_id: int) -> List[Assignment]:
         """获取某个考场的所有监考安排"""
-        return [a for a in self.assignments if a.room.id == room_id]
+        return list(self.iter_room_assignments(room_id))
 
     def get_time_slot_assignments(self, time_slot_id: str) -> List[Assignment]:
         """获取某个时间段的所有监考安排"""
-        return [a for a in self.assignments if a.time_slot.id == time_slot_id]
+        return list(self.iter_time_slot_assignments(time_slot_id))
 
     def check_conflicts(self) -> List[str]:
         """检查硬约束冲突"""
         conflicts = []
 
-        # H-E-01: 教师在同一时间只能监考一个考场
-        for teacher in self.teachers:
-            teacher_assignments = self.get_teacher_assignments(teacher.id)
-            time_slot_counts = {}
-            for assignment in teacher_assignments:
-                ts_id = assignment.time_slot.id
-                time_slot_counts[ts_id] = time_slot_counts.get(ts_id, 0) + 1
+        table = self.get_assignment_table()
+        slot_ids = table.slot_ids
+        num_slots = len(slot_ids)
 
-            for ts_id, count in time_slot_counts.items():
-                if count > 1:
-                    conflicts.append(f"教师{teacher.name}在时间段{ts_id}有{count}个监考任务")
+        # H-E-01: 教师在同一时间只能监考一个考场
+        for pos, idx, count in _duplicate_pairs(table.teacher_pos, table.slot_idx,
+                                                len(self.teachers), num_slots):
+            conflicts.append(f"教师{self.teachers[pos].name}在时间段{slot_ids[idx]}有{count}个监考任务")
 
         # H-E-01: 考场在同一时间只能有一场考试
-        for room in self.rooms:
-            room_assignments = self.get_room_assignments(room.id)
-            time_slot_counts = {}
-            for assignment in room_assignments:
-                ts_id = assignment.time_slot.id
-                time_slot_counts[ts_id] = time_slot_counts.get(ts_id, 0) + 1
-
-            for ts_id, count in time_slot_counts.items():
-                if count > 1:
-                    conflicts.append(f"考场{room.name}在时间段{ts_id}有{count}个监考任务")
+        for pos, idx, count in _duplicate_pairs(table.room_pos, table.slot_idx,
+                                                len(self.rooms), num_slots):
+            conflicts.append(f"考场{self.rooms[pos].name}在时间段{slot_ids[idx]}有{count}个监考任务")
 
         return conflicts
 
     def calculate_teacher_load(self, teacher_id: int) -> Tuple[float, float, float]:
         """计算教师的负荷：(本次负荷, 历史负荷, 加权总负荷)"""
+        return self._teacher_load_stats(teacher_id)[:3]
+
+    def _teacher_load_stats(self, teacher_id: int) -> Tuple[float, float, float, int]:
+        """一次遍历教师的安排，同时得到 (本次负荷, 历史负荷, 加权总负荷, 长时科目监考次数)
+
+        结果按教师缓存，该教师的安排增删（add/remove_assignment）、索引重建或长时科目变化时失效；
+        缓存项记录计算时的负荷系数与教师历史负荷，替换/修改约束配置或历史负荷后自动重新计算。
+        """
         teacher = self.teacher_map[teacher_id]
-        assignments = self.get_teacher_assignments(teacher_id)
+        self._ensure_indexes()
+        long_subjects = self.get_long_subjects()
+
+        config = self.config
+        key = (config.invigilation_coefficient, config.study_coefficient,
+               config.current_weight, config.historical_weight, teacher.historical_load,
+               long_subjects)
+        cached = self._load_cache.get(teacher_id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
 
         # 计算本次负荷
         current_load = 0.0
         long_exam_count = 0
 
-        for assignment in assignments:
+        for assignment in self.iter_teacher_assignments(teacher_id):
             duration = assignment.time_slot.duration_minutes
 
             if assignment.is_invigilation:
                 current_load += duration * self.config.invigilation_coefficient
                 # 检查是否为长时科目
-                if any(e.subject == assignment.subject and e.is_long_subject
-                      for e in self.exams):
+                if assignment.subject in long_subjects:
                     long_exam_count += 1
             else:
                 current_load += duration * self.config.study_coefficient
@@ -219,7 +444,9 @@ class ExamSchedule:
         total_weighted = (self.config.current_weight * current_load +
                           self.config.historical_weight * teacher.historical_load)
 
-        return current_load, teacher.historical_load, total_weighted
+        result = (current_load, teacher.historical_load, total_weighted, long_exam_count)
+        self._load_cache[teacher_id] = (key, result)
+        return result
 
     def generate_statistics(self) -> Dict:
         """生成统计报表"""
@@ -229,35 +456,42 @@ class ExamSchedule:
             'fairness_metrics': {}
         }
 
-        all_loads = []
-        all_total_loads = []
-
-        for teacher in self.teachers:
-            current_load, historical_load, total_load = self.calculate_teacher_load(teacher.id)
-            all_loads.append(current_load)
-            all_total_loads.append(total_load)
-
-            stats['teacher_stats'].append({
+        # 全部教师的负荷一次向量化算出
+        offsets, durations, is_invig, is_long = self._build_soa()
+        loads, long_counts = _teacher_loads(offsets, durations, is_invig, is_long,
+                                            self.config.invigilation_coefficient,
+                                            self.config.study_coefficient)
+        historical_loads = np.fromiter((t.historical_load for t in self.teachers),
+                                       dtype=np.float64, count=len(self.teachers))
+        all_total_loads = (self.config.current_weight * loads +
+                           self.config.historical_weight * historical_loads)
+
+        # 各列先整体转为Python标量，再逐教师组装统计字典
+        stats['teacher_stats'] = [
+            {
                 'teacher_id': teacher.id,
                 'teacher_name': teacher.name,
-                'subject': teacher.subject.value,
+                'subject': _SUBJECT_LABELS[teacher.subject],
                 'current_load': current_load,
-                'historical_load': historical_load,
+                'historical_load': teacher.historical_load,
                 'total_weighted_load': total_load,
-                'assignment_count': len(self.get_teacher_assignments(teacher.id)),
-                'long_exam_count': self._count_long_exams(teacher.id)
-            })
+                'assignment_count': assignment_count,
+                'long_exam_count': long_exam_count
+            }
+            for teacher, current_load, total_load, assignment_count, long_exam_count in zip(
+                self.teachers, loads.tolist(), all_total_loads.tolist(),
+                np.diff(offsets).tolist(), long_counts.tolist())
+        ]
 
-        # 公平性指标
-        if all_total_loads:
-            max_load = max(all_total_loads)
-            min_load = min(all_total_loads)
-            avg_load = sum(all_total_loads) / len(all_total_loads)
+        # 公平性指标（直接在加权总负荷数组上用NumPy归约）
+        if stats['teacher_stats']:
+            max_load = float(all_total_loads.max())
+            min_load = float(all_total_loads.min())
 
             stats['fairness_metrics'] = {
                 'max_total_load': max_load,
                 'min_total_load': min_load,
-                'avg_total_load': avg_load,
+                'avg_total_load': float(all_total_loads.mean()),
                 'load_range': max_load - min_load,
                 'load_std': self._calculate_std(all_total_loads)
             }
@@ -271,21 +505,61 @@ class ExamSchedule:
 
         return stats
 
+    def get_assignment_table(self) -> AssignmentTable:
+        """获取安排的列式镜像
+
+        assignments/teachers/rooms列表被替换或长度变化时重建；原地替换元素后需调用invalidate_cache()。
+        """
+        sources = (self.assignments, self.teachers, self.rooms)
+        sizes = tuple(map(len, sources))
+        cache = self._table_cache
+        if cache is None or cache[1] != sizes or any(a is not b for a, b in zip(cache[0], sources)):
+            table = AssignmentTable.build(self.assignments, self.teachers, self.rooms, self.time_slot_index)
+            cache = self._table_cache = (sources, sizes, table)
+        return cache[2]
+
+    def _build_soa(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """按self.teachers顺序将安排打包为列式数组：(CSR偏移, 时长, 是否监考, 是否长时科目)"""
+        table = self.get_assignment_table()
+        long_subjects = self.get_long_subjects()
+        long_mask = np.array([subject in long_subjects for subject in SubjectType], dtype=np.bool_)
+
+        # 分组保持同一教师内的安排顺序，与逐条累加的结果一致
+        order, offsets = _group_rows(table.teacher_pos, len(self.teachers))
+
+        return offsets, table.durations[order], table.is_invig[order], long_mask[table.subject_idx[order]]
+
     def _count_long_exams(self, teacher_id: int) -> int:
         """统计教师的长时科目监考次数"""
-        assignments = self.get_teacher_assignments(teacher_id)
-        count = 0
-        for assignment in assignments:
-            if (assignment.is_invigilation and
-                any(e.subject == assignment.subject and e.is_long_subject
-                    for e in self.exams)):
-                count += 1
-        return count
+        return self._teacher_load_stats(teacher_id)[3]
+
+    def get_long_subjects(self) -> FrozenSet[SubjectType]:
+        """获取长时科目集合（存在任一场长时考试的科目），替代逐条安排扫描全部考试"""
+        return self._ensure_exam_index()[3]
+
+    def get_exams_by_subject(self, subject: SubjectType) -> Tuple[Exam, ...]:
+        """获取某科目的全部考试（按exams中的顺序），替代遍历全部考试再比较科目"""
+        return self._ensure_exam_index()[2].get(subject, ())
+
+    def _ensure_exam_index(self):
+        """按科目分组的考试索引与长时科目集合
+
+        结果缓存，exams列表被替换或长度变化时重新计算。
+        """
+        cache = self._exam_index_cache
+        if cache is None or cache[0] is not self.exams or cache[1] != len(self.exams):
+            by_subject = defaultdict(list)
+            for exam in self.exams:
+                by_subject[exam.subject].append(exam)
+            long_subjects = frozenset(e.subject for e in self.exams if e.is_long_subject)
+            cache = self._exam_index_cache = (
+                self.exams, len(self.exams),
+                {subject: tuple(exams) for subject, exams in by_subject.items()},
+                long_subjects)
+        return cache
 
     def _calculate_std(self, values: List[float]) -> float:
-        """计算标准差"""
+        """计算标准差（总体标准差，ddof=0）"""
         if len(values) <= 1:
             return 0.0
-        mean = sum(values) / len(values)
-        variance = sum((x - mean) ** 2 for x in values) / len(values)
-        return variance ** 0.5
\ No newline at end of file
+        return float(np.std(values))
\ No newline at end of file
@@ -2,6 +2,10 @@
 OR-Tools约束规划求解器
 基于Google OR-Tools的CP-SAT求解器实现智能排考
 """
+import os
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 from ortools.sat.python import cp_model
 
@@ -11,16 +15,42 @@ from models import (
 )
 
 
+@lru_cache(maxsize=None)
+def _date_ordinal(date_str: str) -> int:
+    """'YYYY-MM-DD'日期转为序数（按日期字符串缓存，避免重复strptime）"""
+    return datetime.strptime(date_str, "%Y-%m-%d").toordinal()
+
+
 class ORToolsSolver:
     """OR-Tools CP-SAT求解器"""
 
-    def __init__(self, schedule: ExamSchedule):
+    # 默认搜索线程数上限：超过16个后CP-SAT的LNS组合不再增加新的搜索策略
+    MAX_SEARCH_WORKERS = 16
+
+    def __init__(self, schedule: ExamSchedule, cpu_budget: Optional[int] = None,
+                 log_search_progress: bool = False):
+        """cpu_budget为可用的搜索线程数（None时按CPU核数自动选择）；
+        log_search_progress为True时输出CP-SAT搜索日志，便于调试。
+        """
         self.schedule = schedule
         self.model = cp_model.CpModel()
         self.solver = cp_model.CpSolver()
 
         # 变量存储
-        self.assign_vars = {}  # X[t][r][s] 教师t在时间段s被分配到教室r
+        self.assign_vars = {}  # X[t][r][s] 教师t在时间段s被分配到教室r（只为可能取1的组合建变量）
+        self.teacher_slot_vars = {}  # {(教师id, 时间段id): 该教师在该时间段的全部X变量}
+        self.room_slot_vars = {}  # {(考场id, 时间段id): 该考场在该时间段的全部X变量}
+
+        # 查找表（build_model开始时构建，替代建模过程中对考试/时间段的线性扫描）
+        self._exams_by_slot = {}  # {时间段id: [该时间段的考试]}
+        self._exam_by_room_slot = {}  # {(考场id, 时间段id): 考试}
+        self._slots_by_date = {}  # {日期: [该日期的时间段]}
+        self._dates = []  # 全部考试日期（升序）
+
+        # 负荷项（创建辅助变量时收集，供变量定义域与负荷约束共用）
+        self._inv_load_terms = {}  # {教师id: (X变量列表, 时长列表)}
+        self._long_exam_terms = {}  # {教师id: 长时科目X变量列表}
+        self._long_exam_ub = {}  # {教师id: 长时科目计数上界}
         self.auxiliary_vars = {}  # 辅助变量
 
         # 求解结果
@@ -30,13 +60,22 @@ class ORToolsSolver:
 
         # 设置求解器参数
         self.solver.parameters.max_time_in_seconds = 60  # 最大求解时间60秒
-        self.solver.parameters.num_search_workers = 8    # 使用8个搜索线程
-        self.solver.parameters.log_search_progress = False
+        # 搜索线程数：未指定预算时至少8个（CP-SAT并行组合搜索的常用规模），
+        # 多核机器上按CPU核数扩展，最多MAX_SEARCH_WORKERS个
+        if cpu_budget is None:
+            num_workers = min(max(8, os.cpu_count() or 8), self.MAX_SEARCH_WORKERS)
+        else:
+            num_workers = max(1, cpu_budget)
+        self.solver.parameters.num_search_workers = num_workers
+        self.solver.parameters.log_search_progress = log_search_progress
 
     def build_model(self):
         """构建数学模型"""
         print("构建OR-Tools模型...")
 
+        # 0. 构建查找表
+        self._build_lookup_tables()
+
         # 1. 创建决策变量
         self._create_decision_variables()
 
@@ -51,16 +90,68 @@ class ORToolsSolver:
 
         print("模型构建完成")
 
+    def _build_lookup_tables(self):
+        """一次性构建按时间段/考场/日期索引的查找表"""
+        exams_by_slot = defaultdict(list)
+        exam_by_room_slot = {}
+        for exam in self.schedule.exams:
+            slot_id = exam.time_slot.id
+            exams_by_slot[slot_id].append(exam)
+            for room in exam.rooms:
+                # 同一考场同一时间段有多场考试时以第一场为准（与原线性扫描一致）
+                exam_by_room_slot.setdefault((room.id, slot_id), exam)
+
+        slots_by_date = defaultdict(list)
+        for time_slot in self.schedule.time_slots:
+            slots_by_date[time_slot.date].append(time_slot)
+
+        self._exams_by_slot = dict(exams_by_slot)
+        self._exam_by_room_slot = exam_by_room_slot
+        self._slots_by_date = dict(slots_by_date)
+        self._dates = sorted(slots_by_date)
+
     def _create_decision_variables(self):
-        """创建决策变量 X[t][r][s]"""
+        """创建决策变量 X[t][r][s]
+
+        只为该时间段有考试的考场（及教师固定任务指定的考场）建变量：
+        其他考场不受任何约束、取1只会增加惩罚，最优解中恒为0，无需进入模型。
+        教师不可用的时间段（H-E-02/03/04）与学科回避（H-E-05）的组合恒为0，同样不建变量。
+        """
         print("创建决策变量...")
 
-        # 为每个教师-考场-时间组合创建布尔变量
+        # 每个时间段实际使用的考场（按考试顺序去重）
+        slot_rooms = {}
+        for time_slot in self.schedule.time_slots:
+            rooms = slot_rooms[time_slot.id] = {}
+            for exam in self._exams_by_slot.get(time_slot.id, ()):
+                for room in exam.rooms:
+                    rooms.setdefault(room.id, room)
+
+        # 固定任务指定的 (考场, 时间段) 按教师补充
+        fixed_rooms = {}
+        for teacher, room, time_slot in self._iter_fixed_duty_targets():
+            fixed_rooms.setdefault((teacher.id, time_slot.id), []).append(room)
+
+        unavailable = self._get_unavailable_slots()
+        avoided = self._get_subject_avoidance_keys()
+
         for teacher in self.schedule.teachers:
-            for room in self.schedule.rooms:
-                for time_slot in self.schedule.time_slots:
-                    var_name = f"assign_{teacher.id}_{room.id}_{time_slot.id}"
-                    self.assign_vars[(teacher.id, room.id, time_slot.id)] = self.model.NewBoolVar(var_name)
+            for time_slot in self.schedule.time_slots:
+                slot_vars = self.teacher_slot_vars[(teacher.id, time_slot.id)] = []
+                if (teacher.id, time_slot.id) in unavailable:
+                    continue
+
+                rooms = dict(slot_rooms[time_slot.id])
+                for room in fixed_rooms.get((teacher.id, time_slot.id), ()):
+                    rooms.setdefault(room.id, room)
+
+                for room_id in rooms:
+                    key = (teacher.id, room_id, time_slot.id)
+                    if key in avoided:
+                        continue
+                    var = self.assign_vars[key] = self.model.NewBoolVar(f"assign_{teacher.id}_{room_id}_{time_slot.id}")
+                    slot_vars.append(var)
+                    self.room_slot_vars.setdefault((room_id, time_slot.id), []).append(var)
 
     def _add_hard_constraints(self):
         """添加硬约束条件"""
@@ -68,40 +159,27 @@ class ORToolsSolver:
 
         # H-E-01: 考场/自习室覆盖约束 - 每个考场在每个时间段必须有且仅有一名教师
         for time_slot in self.schedule.time_slots:
-            for exam in self.schedule.exams:
-                if exam.time_slot.id == time_slot.id:
-                    # 为该时间段的每个考场添加约束
-                    for room in exam.rooms:
-                        teacher_assignments = []
-                        for teacher in self.schedule.teachers:
-                            teacher_assignments.append(
-                                self.assign_vars[(teacher.id, room.id, time_slot.id)]
-                            )
-                        # 每个考场必须有且仅有一名教师
-                        self.model.Add(sum(teacher_assignments) == 1)
+            for exam in self._exams_by_slot.get(time_slot.id, ()):
+                # 为该时间段的每个考场添加约束
+                for room in exam.rooms:
+                    # 每个考场必须有且仅有一名教师（没有可用教师时为空的ExactlyOne，模型不可行）
+                    teacher_assignments = self.room_slot_vars.get((room.id, time_slot.id), [])
+                    self.model.AddExactlyOne(teacher_assignments)
 
         # H-E-01: 教师时空冲突约束 - 每个教师在同一时间只能在一个考场
-        for teacher in self.schedule.teachers:
-            for time_slot in self.schedule.time_slots:
-                room_assignments = []
-                for room in self.schedule.rooms:
-                    room_assignments.append(
-                        self.assign_vars[(teacher.id, room.id, time_slot.id)]
-                    )
-                # 每个教师在同一时间最多只能在一个考场
-                self.model.Add(sum(room_assignments) <= 1)
-
-        # H-E-02, 03, 04: 教师不可用约束
-        self._add_teacher_availability_constraints()
+        for room_assignments in self.teacher_slot_vars.values():
+            # 每个教师在同一时间最多只能在一个考场（可选考场不超过一个时无需约束）
+            if len(room_assignments) > 1:
+                self.model.AddAtMostOne(room_assignments)
 
-        # H-E-05: 学科回避约束
-        self._add_subject_avoidance_constraints()
+        # H-E-02, 03, 04, 05: 教师不可用与学科回避的组合已在建变量时剔除
 
         # H-E-09: 固定任务约束
         self._add_fixed_duty_constraints()
 
-    def _add_teacher_availability_constraints(self):
-        """添加教师可用性约束（授课、请假、改卷）"""
+    def _get_unavailable_slots(self) -> set:
+        """教师不可用（授课、请假、改卷）的 (教师id, 时间段id) 集合"""
+        unavailable = set()
         for teacher in self.schedule.teachers:
             for time_slot in self.schedule.time_slots:
 
@@ -126,46 +204,34 @@ class ORToolsSolver:
 
                 # 3. 改卷时间冲突 H-E-04
                 # 科目考完后T+1天该科目教师不可监考
-                for exam in self.schedule.exams:
-                    if (exam.subject == teacher.subject and
-                        self._is_grading_period(time_slot, exam.time_slot)):
+                for exam in self.schedule.get_exams_by_subject(teacher.subject):
+                    if self._is_grading_period(time_slot, exam.time_slot):
                         is_unavailable = True
                         break
 
                 # 如果教师不可用，则不能分配任何监考任务
                 if is_unavailable:
-                    for room in self.schedule.rooms:
-                        self.model.Add(
-                            self.assign_vars[(teacher.id, room.id, time_slot.id)] == 0
-                        )
+                    unavailable.add((teacher.id, time_slot.id))
+
+        return unavailable
 
     def _is_grading_period(self, current_time: TimeSlot, exam_time: TimeSlot) -> bool:
         """判断当前时间是否为改卷期间"""
         # 简化实现：如果当前时间在考试时间的下一天或之后，则为改卷期间
-        current_date = current_time.date
-        exam_date = exam_time.date
-
-        # 计算日期差
-        from datetime import datetime, timedelta
-        current_dt = datetime.strptime(current_date, "%Y-%m-%d")
-        exam_dt = datetime.strptime(exam_date, "%Y-%m-%d")
-
-        date_diff = (current_dt - exam_dt).days
+        date_diff = _date_ordinal(current_time.date) - _date_ordinal(exam_time.date)
         return date_diff >= 1  # T+1天及之后
 
-    def _add_subject_avoidance_constraints(self):
-        """添加学科回避约束 H-E-05"""
+    def _get_subject_avoidance_keys(self) -> set:
+        """学科回避 H-E-05：教师不能监考自己教授科目的 (教师id, 考场id, 时间段id) 集合"""
+        avoided = set()
         for teacher in self.schedule.teachers:
-            for exam in self.schedule.exams:
-                if exam.subject == teacher.subject:
-                    # 该教师不能监考自己教授的科目
-                    for room in exam.rooms:
-                        self.model.Add(
-                            self.assign_vars[(teacher.id, room.id, exam.time_slot.id)] == 0
-                        )
+            for exam in self.schedule.get_exams_by_subject(teacher.subject):
+                for room in exam.rooms:
+                    avoided.add((teacher.id, room.id, exam.time_slot.id))
+        return avoided
 
-    def _add_fixed_duty_constraints(self):
-        """添加固定任务约束 H-E-09"""
+    def _iter_fixed_duty_targets(self):
+        """遍历教师固定任务对应的 (教师, 考场, 时间段)，找不到考场或时间的任务跳过"""
         for teacher in self.schedule.teachers:
             for fixed_date, fixed_slot, fixed_room in teacher.fixed_duties:
                 # 查找对应的考场和时间
@@ -183,57 +249,95 @@ class ORToolsSolver:
                         target_time_slot = time_slot
                         break
 
-                # 如果找到了对应的考场和时间，强制分配
                 if target_room and target_time_slot:
-                    self.model.Add(
-                        self.assign_vars[(teacher.id, target_room.id, target_time_slot.id)] == 1
-                    )
+                    yield teacher, target_room, target_time_slot
+
+    def _add_fixed_duty_constraints(self):
+        """添加固定任务约束 H-E-09"""
+        # 如果找到了对应的考场和时间，强制分配
+        for teacher, room, time_slot in self._iter_fixed_duty_targets():
+            var = self.assign_vars.get((teacher.id, room.id, time_slot.id))
+            if var is None:
+                # 固定任务落在不可用/学科回避的组合上，无法满足：空子句使模型不可行
+                self.model.AddBoolOr([])
+            else:
+                self.model.Add(var == 1)
 
     def _create_auxiliary_variables(self):
         """创建辅助变量用于计算软约束"""
         print("创建辅助变量...")
 
-        # 1. 教师时段占用变量 IsAssigned[t][s]
+        # 1. 教师时段占用 IsAssigned[t][s]
+        # 硬约束已保证 sum_r X[t,r,s] <= 1，直接以该和式作为0/1表达式，不再新建布尔变量
         self.auxiliary_vars['is_assigned'] = {}
         for teacher in self.schedule.teachers:
             for time_slot in self.schedule.time_slots:
-                var_name = f"is_assigned_{teacher.id}_{time_slot.id}"
-                self.auxiliary_vars['is_assigned'][(teacher.id, time_slot.id)] = self.model.NewBoolVar(var_name)
+                assignments = self.teacher_slot_vars.get((teacher.id, time_slot.id))
+                self.auxiliary_vars['is_assigned'][(teacher.id, time_slot.id)] = (
+                    cp_model.LinearExpr.Sum(assignments) if assignments else 0
+                )
+
+        # 2. 教师负荷与长时科目计数变量（变量定义域取各教师可承担任务推出的解析上下界）
+        config = self.schedule.config
+        inv_coef = int(config.invigilation_coefficient * 100)
+        current_weight = int(config.current_weight * 100)
+        historical_weight = int(config.historical_weight * 100)
 
-        # 2. 教师负荷变量
         self.auxiliary_vars['current_inv_load'] = {}
         self.auxiliary_vars['current_study_load'] = {}
         self.auxiliary_vars['current_weighted_load'] = {}
         self.auxiliary_vars['total_weighted_load'] = {}
+        self.auxiliary_vars['long_exam_count'] = {}
+        self._inv_load_terms = {}
+        self._long_exam_terms = {}
+        self._long_exam_ub = {}
+        total_lower_bounds = []
+        total_upper_bounds = []
 
         for teacher in self.schedule.teachers:
+            inv_load_vars, inv_load_durations, long_exam_terms = self._collect_load_terms(teacher)
+            self._inv_load_terms[teacher.id] = (inv_load_vars, inv_load_durations)
+            self._long_exam_terms[teacher.id] = long_exam_terms
+
+            # 每个时间段至多监考一场，上界按时间段取最大可能负荷累加
+            inv_ub = self._slot_capped_bound(teacher, inv_load_vars, inv_load_durations)
+            # 加权负荷为系数放大100倍后向上取整，上下界同样按此换算
+            weighted_ub = (inv_ub * inv_coef + 99) // 100
+            hist_term = historical_weight * int(teacher.historical_load)
+            total_lb = (hist_term + 99) // 100
+            total_ub = (weighted_ub * current_weight + hist_term + 99) // 100
+            total_lower_bounds.append(total_lb)
+            total_upper_bounds.append(total_ub)
+
             # 当前监考负荷
             var_name = f"current_inv_load_{teacher.id}"
-            self.auxiliary_vars['current_inv_load'][teacher.id] = self.model.NewIntVar(0, 10000, var_name)
+            self.auxiliary_vars['current_inv_load'][teacher.id] = self.model.NewIntVar(0, inv_ub, var_name)
 
-            # 当前自习负荷
+            # 当前自习负荷（暂未建模，恒为0）
             var_name = f"current_study_load_{teacher.id}"
-            self.auxiliary_vars['current_study_load'][teacher.id] = self.model.NewIntVar(0, 10000, var_name)
+            self.auxiliary_vars['current_study_load'][teacher.id] = self.model.NewIntVar(0, 0, var_name)
 
             # 当前加权负荷 - 使用整数变量（放大100倍避免浮点数）
             var_name = f"current_weighted_load_{teacher.id}"
-            self.auxiliary_vars['current_weighted_load'][teacher.id] = self.model.NewIntVar(0, 10000, var_name)
+            self.auxiliary_vars['current_weighted_load'][teacher.id] = self.model.NewIntVar(0, weighted_ub, var_name)
 
             # 总加权负荷 - 使用整数变量（放大100倍避免浮点数）
             var_name = f"total_weighted_load_{teacher.id}"
-            self.auxiliary_vars['total_weighted_load'][teacher.id] = self.model.NewIntVar(0, 10000, var_name)
-
-        # 3. 公平性极值变量
-        self.auxiliary_vars['max_total_load'] = self.model.NewIntVar(0, 10000, "max_total_load")
-        self.auxiliary_vars['min_total_load'] = self.model.NewIntVar(0, 10000, "min_total_load")
+            self.auxiliary_vars['total_weighted_load'][teacher.id] = self.model.NewIntVar(total_lb, total_ub, var_name)
 
-        # 4. 长时科目计数变量
-        self.auxiliary_vars['long_exam_count'] = {}
-        for teacher in self.schedule.teachers:
+            # 长时科目计数
             var_name = f"long_exam_count_{teacher.id}"
-            self.auxiliary_vars['long_exam_count'][teacher.id] = self.model.NewIntVar(0, 100, var_name)
+            long_ub = self._slot_capped_bound(teacher, long_exam_terms, [1] * len(long_exam_terms))
+            self._long_exam_ub[teacher.id] = long_ub
+            self.auxiliary_vars['long_exam_count'][teacher.id] = self.model.NewIntVar(0, long_ub, var_name)
 
-        # 5. 午休违反变量
+        # 3. 公平性极值变量（最大值不低于各教师下界的最大者，最小值不高于各教师上界的最小者）
+        self.auxiliary_vars['max_total_load'] = self.model.NewIntVar(
+            max(total_lower_bounds, default=0), max(total_upper_bounds, default=0), "max_total_load")
+        self.auxiliary_vars['min_total_load'] = self.model.NewIntVar(
+            min(total_lower_bounds, default=0), min(total_upper_bounds, default=0), "min_total_load")
+
+        # 4. 午休违反变量
         self.auxiliary_vars['violates_lunch'] = {}
         for teacher in self.schedule.teachers:
             for time_slot in self.schedule.time_slots:
@@ -241,22 +345,51 @@ class ORToolsSolver:
                     var_name = f"violates_lunch_{teacher.id}_{time_slot.id}"
                     self.auxiliary_vars['violates_lunch'][(teacher.id, time_slot.id)] = self.model.NewBoolVar(var_name)
 
-        # 6. 每日负荷变量
+        # 5. 每日负荷变量
         self.auxiliary_vars['daily_count'] = {}
         for teacher in self.schedule.teachers:
-            dates = set(ts.date for ts in self.schedule.time_slots)
-            for date in dates:
+            for date in self._dates:
                 var_name = f"daily_count_{teacher.id}_{date}"
-                self.auxiliary_vars['daily_count'][(teacher.id, date)] = self.model.NewIntVar(0, 10, var_name)
+                self.auxiliary_vars['daily_count'][(teacher.id, date)] = self.model.NewIntVar(
+                    0, len(self._slots_by_date[date]), var_name)
 
-        # 7. 任务集中度变量
+        # 6. 任务集中度变量
         self.auxiliary_vars['split_day'] = {}
         for teacher in self.schedule.teachers:
-            dates = set(ts.date for ts in self.schedule.time_slots)
-            for date in dates:
+            for date in self._dates:
                 var_name = f"split_day_{teacher.id}_{date}"
                 self.auxiliary_vars['split_day'][(teacher.id, date)] = self.model.NewBoolVar(var_name)
 
+    def _collect_load_terms(self, teacher: Teacher):
+        """收集教师的监考负荷项 (变量列表, 时长列表) 与长时科目计数项"""
+        inv_load_vars = []
+        inv_load_durations = []
+        long_exam_terms = []
+        for exam in self.schedule.exams:
+            time_slot = exam.time_slot
+            for room in exam.rooms:
+                assign_var = self.assign_vars.get((teacher.id, room.id, time_slot.id))
+                if assign_var is None:
+                    continue
+                # 监考负荷（自习负荷暂时简化处理）
+                inv_load_vars.append(assign_var)
+                inv_load_durations.append(time_slot.duration_minutes)
+                if exam.is_long_subject:
+                    long_exam_terms.append(assign_var)
+        return inv_load_vars, inv_load_durations, long_exam_terms
+
+    def _slot_capped_bound(self, teacher: Teacher, variables: list, weights: list) -> int:
+        """加权和 sum(w * X) 的上界：同一时间段教师至多在一个考场，按时间段取单个考场的最大权重累加"""
+        var_weights = defaultdict(int)
+        for var, weight in zip(variables, weights):
+            var_weights[var.Index()] += weight
+
+        bound = 0
+        for time_slot in self.schedule.time_slots:
+            slot_vars = self.teacher_slot_vars.get((teacher.id, time_slot.id), ())
+            bound += max((var_weights.get(var.Index(), 0) for var in slot_vars), default=0)
+        return bound
+
     def _add_objective_function(self):
         """添加目标函数（最小化软约束违反）"""
         print("添加目标函数...")
@@ -267,126 +400,99 @@ class ORToolsSolver:
         # 1. 添加辅助变量的定义约束
         self._add_auxiliary_constraints()
 
+        # 各项惩罚直接以线性表达式计入目标函数，不再为每项合计新建IntVar及等式约束
         # 2. S-E-01: 核心公平性惩罚 (加权总负荷极差)
-        fairness_penalty = self.model.NewIntVar(0, 100000, "fairness_penalty")
-        self.model.Add(fairness_penalty >= self.auxiliary_vars['max_total_load'] -
-                       self.auxiliary_vars['min_total_load'])
-        objective_terms.append(fairness_penalty * config.fairness_weight)
+        # max_total_load >= 各教师总负荷 >= min_total_load，极差非负，无需单独的惩罚变量
+        objective_terms.append(
+            (self.auxiliary_vars['max_total_load'] - self.auxiliary_vars['min_total_load']) *
+            config.fairness_weight
+        )
 
         # 3. S-E-03: 长时科目平衡惩罚
+        avg_long = 2.0  # 简化的平均值
         long_exam_penalty = []
         for teacher in self.schedule.teachers:
+            # 计算超出平均的部分（计数上界不超过平均值时超额恒为0，不建变量）
+            excess_ub = self._long_exam_ub[teacher.id] - int(avg_long)
+            if excess_ub <= 0:
+                continue
             count = self.auxiliary_vars['long_exam_count'][teacher.id]
-            # 计算超出平均的部分
-            excess = self.model.NewIntVar(0, 100, f"excess_long_{teacher.id}")
-            avg_long = 2.0  # 简化的平均值
+            excess = self.model.NewIntVar(0, excess_ub, f"excess_long_{teacher.id}")
             self.model.Add(excess >= count - int(avg_long))
             long_exam_penalty.append(excess)
 
         if long_exam_penalty:
-            total_long_penalty = self.model.NewIntVar(0, 10000, "total_long_penalty")
-            self.model.Add(total_long_penalty == sum(long_exam_penalty))
-            objective_terms.append(total_long_penalty * config.long_exam_weight)
+            objective_terms.append(cp_model.LinearExpr.Sum(long_exam_penalty) * config.long_exam_weight)
 
         # 4. S-E-04: 午休保障惩罚
-        lunch_penalty = []
-        for (teacher_id, time_slot_id), var in self.auxiliary_vars['violates_lunch'].items():
-            lunch_penalty.append(var)
+        lunch_penalty = list(self.auxiliary_vars['violates_lunch'].values())
 
         if lunch_penalty:
-            total_lunch_penalty = self.model.NewIntVar(0, 1000, "total_lunch_penalty")
-            self.model.Add(total_lunch_penalty == sum(lunch_penalty))
-            objective_terms.append(total_lunch_penalty * config.lunch_weight)
+            objective_terms.append(cp_model.LinearExpr.Sum(lunch_penalty) * config.lunch_weight)
 
         # 5. S-E-06: 每日负荷惩罚
         daily_penalty = []
         for (teacher_id, date), var in self.auxiliary_vars['daily_count'].items():
-            excess = self.model.NewIntVar(0, 10, f"excess_daily_{teacher_id}_{date}")
+            # 当天时间段数不超过舒适上限时超额恒为0，不建变量
+            excess_ub = len(self._slots_by_date[date]) - config.daily_comfort_limit
+            if excess_ub <= 0:
+                continue
+            excess = self.model.NewIntVar(0, excess_ub, f"excess_daily_{teacher_id}_{date}")
             self.model.Add(excess >= var - config.daily_comfort_limit)
             daily_penalty.append(excess)
 
         if daily_penalty:
-            total_daily_penalty = self.model.NewIntVar(0, 1000, "total_daily_penalty")
-            self.model.Add(total_daily_penalty == sum(daily_penalty))
-            objective_terms.append(total_daily_penalty * config.daily_limit_weight)
+            objective_terms.append(cp_model.LinearExpr.Sum(daily_penalty) * config.daily_limit_weight)
 
         # 6. S-E-05: 任务集中度惩罚
-        concentration_penalty = []
-        for var in self.auxiliary_vars['split_day'].values():
-            concentration_penalty.append(var)
+        concentration_penalty = list(self.auxiliary_vars['split_day'].values())
 
         if concentration_penalty:
-            total_concentration_penalty = self.model.NewIntVar(0, 100, "total_concentration_penalty")
-            self.model.Add(total_concentration_penalty == sum(concentration_penalty))
-            objective_terms.append(total_concentration_penalty * config.concentration_weight)
+            objective_terms.append(cp_model.LinearExpr.Sum(concentration_penalty) * config.concentration_weight)
 
         # 设置目标函数
         if objective_terms:
-            self.model.Minimize(sum(objective_terms))
+            self.model.Minimize(cp_model.LinearExpr.Sum(objective_terms))
 
     def _add_auxiliary_constraints(self):
         """添加辅助变量的定义约束"""
         config = self.schedule.config
 
-        # 1. IsAssigned[t][s] 定义
-        for teacher in self.schedule.teachers:
-            for time_slot in self.schedule.time_slots:
-                assignments = []
-                for room in self.schedule.rooms:
-                    assignments.append(self.assign_vars[(teacher.id, room.id, time_slot.id)])
-
-                self.model.Add(
-                    self.auxiliary_vars['is_assigned'][(teacher.id, time_slot.id)] == sum(assignments)
-                )
+        # 1. IsAssigned[t][s] 直接为 sum_r X[t,r,s] 表达式，无需定义约束
 
-        # 2. 负荷计算约束
+        # 2. 负荷计算约束（加权系数放大100倍取整）
+        inv_coef = int(config.invigilation_coefficient * 100)
+        study_coef = int(config.study_coefficient * 100)
+        current_weight = int(config.current_weight * 100)
+        historical_weight = int(config.historical_weight * 100)
         for teacher in self.schedule.teachers:
-            inv_load_terms = []
-            study_load_terms = []
-
-            for exam in self.schedule.exams:
-                time_slot = exam.time_slot
-
-                for room in exam.rooms:
-                    assign_var = self.assign_vars[(teacher.id, room.id, time_slot.id)]
-                    duration = time_slot.duration_minutes
-
-                    # 监考负荷
-                    inv_load_terms.append(assign_var * duration)
-                    # 自习负荷（这个可能需要根据自习室定义调整）
-                    # 暂时简化处理
+            # 变量与系数已在创建辅助变量时分两个列表收集，由WeightedSum一次构建表达式
+            inv_load_vars, inv_load_durations = self._inv_load_terms[teacher.id]
 
             # 当前监考负荷
             self.model.Add(
-                self.auxiliary_vars['current_inv_load'][teacher.id] == sum(inv_load_terms)
+                self.auxiliary_vars['current_inv_load'][teacher.id] ==
+                cp_model.LinearExpr.WeightedSum(inv_load_vars, inv_load_durations)
             )
 
             # 当前自习负荷（暂时为0）
             self.model.Add(self.auxiliary_vars['current_study_load'][teacher.id] == 0)
 
-            # 当前加权负荷 - 使用整数计算（系数放大100倍）
-            self.model.Add(
-                self.auxiliary_vars['current_weighted_load'][teacher.id] * 100 >=
-                (self.auxiliary_vars['current_inv_load'][teacher.id] * int(config.invigilation_coefficient * 100) +
-                 self.auxiliary_vars['current_study_load'][teacher.id] * int(config.study_coefficient * 100))
-            )
-            self.model.Add(
-                self.auxiliary_vars['current_weighted_load'][teacher.id] * 100 <=
-                (self.auxiliary_vars['current_inv_load'][teacher.id] * int(config.invigilation_coefficient * 100) +
-                 self.auxiliary_vars['current_study_load'][teacher.id] * int(config.study_coefficient * 100) + 99)
+            # 当前加权负荷 - 系数放大100倍后除以100向上取整（原生除法约束）
+            self.model.AddDivisionEquality(
+                self.auxiliary_vars['current_weighted_load'][teacher.id],
+                self.auxiliary_vars['current_inv_load'][teacher.id] * inv_coef +
+                self.auxiliary_vars['current_study_load'][teacher.id] * study_coef + 99,
+                100
             )
 
-            # 总加权负荷 - 使用整数计算（系数放大100倍）
+            # 总加权负荷 - 系数放大100倍后除以100向上取整
             hist_load_int = int(teacher.historical_load)
-            self.model.Add(
-                self.auxiliary_vars['total_weighted_load'][teacher.id] * 100 >=
-                (int(config.current_weight * 100) * self.auxiliary_vars['current_weighted_load'][teacher.id] +
-                 int(config.historical_weight * 100) * hist_load_int)
-            )
-            self.model.Add(
-                self.auxiliary_vars['total_weighted_load'][teacher.id] * 100 <=
-                (int(config.current_weight * 100) * self.auxiliary_vars['current_weighted_load'][teacher.id] +
-                 int(config.historical_weight * 100) * hist_load_int + 99)
+            self.model.AddDivisionEquality(
+                self.auxiliary_vars['total_weighted_load'][teacher.id],
+                self.auxiliary_vars['current_weighted_load'][teacher.id] * current_weight +
+                historical_weight * hist_load_int + 99,
+                100
             )
 
         # 3. 公平性极值约束
@@ -402,21 +508,14 @@ class ORToolsSolver:
 
         # 4. 长时科目计数约束
         for teacher in self.schedule.teachers:
-            long_exam_terms = []
-            for exam in self.schedule.exams:
-                if exam.is_long_subject:
-                    time_slot = exam.time_slot
-                    for room in exam.rooms:
-                        assign_var = self.assign_vars[(teacher.id, room.id, time_slot.id)]
-                        long_exam_terms.append(assign_var)
-
             self.model.Add(
-                self.auxiliary_vars['long_exam_count'][teacher.id] == sum(long_exam_terms)
+                self.auxiliary_vars['long_exam_count'][teacher.id] ==
+                cp_model.LinearExpr.Sum(self._long_exam_terms[teacher.id])
             )
 
         # 5. 午休违反约束
         for (teacher_id, time_slot_id), var in self.auxiliary_vars['violates_lunch'].items():
-            time_slot = next(ts for ts in self.schedule.time_slots if ts.id == time_slot_id)
+            time_slot = self.schedule.time_slot_map[time_slot_id]
             paired_slot_id = time_slot.is_lunch_pair_with
 
             if paired_slot_id:
@@ -428,38 +527,48 @@ class ORToolsSolver:
 
         # 6. 每日负荷约束
         for teacher in self.schedule.teachers:
-            dates = set(ts.date for ts in self.schedule.time_slots)
-            for date in dates:
-                daily_terms = []
-                for time_slot in self.schedule.time_slots:
-                    if time_slot.date == date:
-                        daily_terms.append(self.auxiliary_vars['is_assigned'][(teacher.id, time_slot.id)])
+            for date in self._dates:
+                daily_terms = [self.auxiliary_vars['is_assigned'][(teacher.id, time_slot.id)]
+                               for time_slot in self._slots_by_date[date]]
 
                 self.model.Add(
-                    self.auxiliary_vars['daily_count'][(teacher.id, date)] == sum(daily_terms)
+                    self.auxiliary_vars['daily_count'][(teacher.id, date)] ==
+                    cp_model.LinearExpr.Sum(daily_terms)
                 )
 
         # 7. 任务集中度约束
         for teacher in self.schedule.teachers:
-            dates = set(ts.date for ts in self.schedule.time_slots)
-            for date in dates:
+            for date in self._dates:
                 morning_assigned = False
                 afternoon_assigned = False
 
-                for time_slot in self.schedule.time_slots:
-                    if time_slot.date == date:
-                        is_assigned = self.auxiliary_vars['is_assigned'][(teacher.id, time_slot.id)]
+                for time_slot in self._slots_by_date[date]:
+                    is_assigned = self.auxiliary_vars['is_assigned'][(teacher.id, time_slot.id)]
 
-                        if time_slot.is_morning:
-                            morning_assigned = True or morning_assigned
-                        elif time_slot.is_afternoon:
-                            afternoon_assigned = True or afternoon_assigned
+                    if time_slot.is_morning:
+                        morning_assigned = True or morning_assigned
+                    elif time_slot.is_afternoon:
+                        afternoon_assigned = True or afternoon_assigned
 
                 # 如果跨越了上下午，则违反任务集中度
                 split_var = self.auxiliary_vars['split_day'][(teacher.id, date)]
                 # 这里需要更精确的逻辑，暂时简化
                 pass
 
+    def add_hint_from(self, assignments: List[Assignment]):
+        """以已有安排（如贪心解）作为求解提示（warm start），需在build_model之后调用
+
+        提示覆盖安排涉及的每个(考场, 时间段)：被选中的教师为1，其余教师为0。
+        """
+        chosen = {(a.teacher.id, a.room.id, a.time_slot.id) for a in assignments}
+        cells = {(room_id, slot_id) for _, room_id, slot_id in chosen}
+        for room_id, slot_id in cells:
+            for teacher in self.schedule.teachers:
+                key = (teacher.id, room_id, slot_id)
+                var = self.assign_vars.get(key)
+                if var is not None:
+                    self.model.AddHint(var, 1 if key in chosen else 0)
+
     def solve(self) -> bool:
         """求解模型"""
         print("开始求解...")
@@ -484,40 +593,43 @@ class ORToolsSolver:
         print("提取求解结果...")
         self.assignments = []
 
-        for teacher in self.schedule.teachers:
-            for room in self.schedule.rooms:
-                for time_slot in self.schedule.time_slots:
-                    var = self.assign_vars[(teacher.id, room.id, time_slot.id)]
-                    if self.solver.Value(var) == 1:
-                        # 判断是否为监考还是自习
-                        is_invigilation = self._is_invigilation_assignment(room, time_slot)
-
-                        assignment = Assignment(
-                            teacher=teacher,
-                            room=room,
-                            time_slot=time_slot,
-                            subject=self._get_assignment_subject(room, time_slot),
-                            is_invigilation=is_invigilation
-                        )
-                        self.assignments.append(assignment)
+        # 只检查已建的变量，结果按 教师→考场→时间段 的原有顺序排列
+        teacher_order = {t.id: i for i, t in enumerate(self.schedule.teachers)}
+        room_order = {r.id: i for i, r in enumerate(self.schedule.rooms)}
+        slot_order = {ts.id: i for i, ts in enumerate(self.schedule.time_slots)}
+        chosen = sorted(
+            (key for key, var in self.assign_vars.items() if self.solver.Value(var) == 1),
+            key=lambda k: (teacher_order[k[0]], room_order[k[1]], slot_order[k[2]])
+        )
+
+        for teacher_id, room_id, time_slot_id in chosen:
+            room = self.schedule.room_map[room_id]
+            time_slot = self.schedule.time_slot_map[time_slot_id]
+
+            # 判断是否为监考还是自习
+            is_invigilation = self._is_invigilation_assignment(room, time_slot)
+
+            assignment = Assignment(
+                teacher=self.schedule.teacher_map[teacher_id],
+                room=room,
+                time_slot=time_slot,
+                subject=self._get_assignment_subject(room, time_slot),
+                is_invigilation=is_invigilation
+            )
+            self.assignments.append(assignment)
 
         print(f"提取到 {len(self.assignments)} 个监考安排")
 
     def _is_invigilation_assignment(self, room: Room, time_slot: TimeSlot) -> bool:
         """判断是否为监考任务"""
         # 检查该房间在该时间段是否为考场
-        for exam in self.schedule.exams:
-            if (exam.time_slot.id == time_slot.id and
-                any(r.id == room.id for r in exam.rooms)):
-                return True
-        return False
+        return (room.id, time_slot.id) in self._exam_by_room_slot
 
     def _get_assignment_subject(self, room: Room, time_slot: TimeSlot) -> SubjectType:
         """获取安排的科目"""
-        for exam in self.schedule.exams:
-            if (exam.time_slot.id == time_slot.id and
-                any(r.id == room.id for r in exam.rooms)):
-                return exam.subject
+        exam = self._exam_by_room_slot.get((room.id, time_slot.id))
+        if exam is not None:
+            return exam.subject
 
         # 默认返回语文科目
         return SubjectType.CHINESE
@@ -117,6 +117,21 @@ class TestIntelligentExamSchedulerIntegration(unittest.TestCase):
         with patch('builtins.print'):
             empty_scheduler.analyze_result()  # 不应该崩溃
 
+    def test_data_cache_independent_of_order(self):
+        """测试标准规模数据与生成顺序无关，且在同一实例内复用"""
+        with patch('builtins.print'):
+            cached = IntelligentExamScheduler()
+            cached.generate_test_data("small")
+            cached.generate_test_data("medium")
+            medium = cached.schedule
+            fresh = IntelligentExamScheduler()
+            fresh.generate_test_data("medium")
+            cached.generate_test_data("medium")
+
+        self.assertEqual([t.historical_load for t in medium.teachers],
+                         [t.historical_load for t in fresh.schedule.teachers])
+        self.assertIs(cached.schedule, medium)
+
     def test_benchmark_functionality(self):
         """测试基准测试功能"""
         with patch('builtins.print') as mock_print:
@@ -315,6 +315,7 @@ class TestExamSchedule(unittest.TestCase):
         self.assertIn(1, self.schedule.teacher_map)
         self.assertIn(101, self.schedule.room_map)
         self.assertIn("2024-01-01-上午", self.schedule.time_slot_map)
+        self.assertEqual(self.schedule.time_slot_index, {"2024-01-01-上午": 0, "2024-01-01-下午": 1})
 
     def test_get_teacher_assignments(self):
         """测试获取教师的监考安排"""
@@ -346,6 +347,24 @@ class TestExamSchedule(unittest.TestCase):
         empty_assignments = self.schedule.get_time_slot_assignments("invalid-time")
         self.assertEqual(len(empty_assignments), 0)
 
+    def test_get_assignment_table(self):
+        """测试安排的列式镜像"""
+        table = self.schedule.get_assignment_table()
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.teacher_pos.tolist(), [0, 1])
+        self.assertEqual(table.room_pos.tolist(), [0, 1])
+        self.assertEqual([table.slot_ids[i] for i in table.slot_idx], ["2024-01-01-上午", "2024-01-01-下午"])
+        self.assertIs(self.schedule.get_assignment_table(), table)
+
+        # 安排列表长度变化后重建
+        self.schedule.assignments.append(self.assignment1)
+        self.assertEqual(len(self.schedule.get_assignment_table()), 3)
+
+    def test_get_exams_by_subject(self):
+        """测试按科目获取考试"""
+        self.assertEqual(self.schedule.get_exams_by_subject(SubjectType.MATH), (self.exam1,))
+        self.assertEqual(self.schedule.get_exams_by_subject(SubjectType.PHYSICS), ())
+
     def test_check_conflicts_no_conflicts(self):
         """测试冲突检查 - 无冲突情况"""
         conflicts = self.schedule.check_conflicts()
@@ -436,6 +455,37 @@ class TestExamSchedule(unittest.TestCase):
         count2 = self.schedule._count_long_exams(2)
         self.assertEqual(count2, 0)  # 教师2监考的不是长时科目
 
+    def test_teacher_load_updates_on_add_and_remove(self):
+        """测试增删安排后教师负荷同步更新"""
+        load_before = self.schedule.calculate_teacher_load(2)[0]
+
+        extra = Assignment(
+            teacher=self.teacher2,
+            room=self.room1,
+            time_slot=self.time_slot2,
+            subject=SubjectType.MATH,
+            is_invigilation=True
+        )
+        self.schedule.add_assignment(extra)
+        self.assertGreater(self.schedule.calculate_teacher_load(2)[0], load_before)
+        self.assertEqual(self.schedule._count_long_exams(2), 1)
+
+        self.schedule.remove_assignment(extra)
+        self.assertEqual(self.schedule.calculate_teacher_load(2)[0], load_before)
+        self.assertEqual(self.schedule._count_long_exams(2), 0)
+
+    def test_teacher_load_follows_config_and_history(self):
+        """测试替换约束配置或修改历史负荷后教师负荷重新计算"""
+        current_load, _, total_before = self.schedule.calculate_teacher_load(1)
+
+        self.schedule.config = ConstraintConfig(invigilation_coefficient=2.0)
+        self.assertEqual(self.schedule.calculate_teacher_load(1)[0], current_load * 2)
+
+        self.teacher1.historical_load += 10.0
+        _, historical_load, total_after = self.schedule.calculate_teacher_load(1)
+        self.assertEqual(historical_load, self.teacher1.historical_load)
+        self.assertNotEqual(total_after, total_before)
+
     def test_calculate_std(self):
         """测试标准差计算"""
         values = [1, 2, 3, 4, 5]
@@ -79,9 +79,24 @@ class TestORToolsSolver(unittest.TestCase):
     def test_solver_parameters(self):
         """测试求解器参数设置"""
         self.assertEqual(self.solver.solver.parameters.max_time_in_seconds, 60)
-        self.assertEqual(self.solver.solver.parameters.num_search_workers, 8)
         self.assertFalse(self.solver.solver.parameters.log_search_progress)
 
+    def test_default_search_workers(self):
+        """测试未指定预算时搜索线程数随CPU核数扩展（至少8个，至多MAX_SEARCH_WORKERS个）"""
+        for cpu_count, expected in [(None, 8), (4, 8), (12, 12), (64, ORToolsSolver.MAX_SEARCH_WORKERS)]:
+            with patch('ortools_solver.os.cpu_count', return_value=cpu_count):
+                solver = ORToolsSolver(self.schedule)
+            self.assertEqual(solver.solver.parameters.num_search_workers, expected)
+
+    def test_solver_cpu_budget(self):
+        """测试线程预算与搜索日志选项"""
+        solver = ORToolsSolver(self.schedule, cpu_budget=2, log_search_progress=True)
+        self.assertEqual(solver.solver.parameters.num_search_workers, 2)
+        self.assertTrue(solver.solver.parameters.log_search_progress)
+
+        solver = ORToolsSolver(self.schedule, cpu_budget=0)
+        self.assertEqual(solver.solver.parameters.num_search_workers, 1)
+
     def test_build_model(self):
         """测试模型构建"""
         self.solver.build_model()
@@ -297,6 +312,74 @@ class TestDEAPSolver(unittest.TestCase):
         self.assertTrue(success)
 
 
+def _reference_hard_penalty(assignments):
+    """逐条安排计算硬约束惩罚的参照实现（用于校验DEAP向量化适应度）"""
+    penalty = 0.0
+    exam_dates_by_subject = {}
+    for assignment in assignments:
+        exam_dates_by_subject.setdefault(assignment.subject, set()).add(assignment.time_slot.date)
+
+    teacher_slots, room_slots = set(), set()
+    for assignment in assignments:
+        teacher, room, time_slot = assignment.teacher, assignment.room, assignment.time_slot
+
+        # H-E-01: 教师/考场时空冲突
+        for key, seen in (((teacher.id, time_slot.id), teacher_slots),
+                          ((room.id, time_slot.id), room_slots)):
+            if key in seen:
+                penalty += 1000
+            seen.add(key)
+
+        # H-E-02, 03, 04: 请假或改卷期（本学科考试日期之后）被安排
+        on_leave = any(leave_date == time_slot.date and leave_slot in time_slot.name
+                       for leave_date, leave_slot in teacher.leave_times)
+        grading = any(time_slot.date > exam_date
+                      for exam_date in exam_dates_by_subject.get(teacher.subject, ()))
+        if on_leave or grading:
+            penalty += 500
+
+        # H-E-09: 固定任务时间被分配到其他考场
+        fixed_times = [(d, s, r) for d, s, r in teacher.fixed_duties
+                       if d == time_slot.date and s in time_slot.name]
+        if fixed_times and all(r != room.name for _, _, r in fixed_times):
+            penalty += 200
+
+    return penalty
+
+
+class TestDEAPFitnessOracle(unittest.TestCase):
+    """DEAP向量化适应度与逐条安排参照实现的一致性测试"""
+
+    def setUp(self):
+        if not DEAP_AVAILABLE:
+            self.skipTest("DEAP未安装")
+
+        from data_generator import DataGenerator
+        self.schedule = DataGenerator(seed=7).create_small_test_case()
+        # 加一个固定任务，覆盖H-E-09
+        exam = self.schedule.exams[0]
+        self.schedule.teachers[0].fixed_duties = [
+            (exam.time_slot.date, exam.time_slot.name, exam.rooms[0].name)
+        ]
+        self.solver = DEAPSolver(self.schedule, population_size=10, generations=1)
+
+    def test_fitness_matches_reference(self):
+        """测试随机个体的硬约束惩罚与适应度和参照实现一致"""
+        import random
+        rng = random.Random(0)
+        teacher_ids = [t.id for t in self.schedule.teachers]
+        for _ in range(50):
+            individual = [rng.choice(teacher_ids) for _ in range(self.solver.chromosome_length)]
+            teacher_idx = self.solver._to_teacher_indices(individual)
+            expected_hard = _reference_hard_penalty(self.solver._chromosome_to_assignments(individual))
+
+            self.assertEqual(self.solver._calculate_hard_constraint_penalties_np(teacher_idx), expected_hard)
+
+            expected = (expected_hard * 10000 if expected_hard > 0
+                        else self.solver._soft_penalty_from_indices(teacher_idx))
+            self.assertAlmostEqual(self.solver._evaluate_individual_fast(individual)[0], expected, places=6)
+
+
 class TestSolverComparison(unittest.TestCase):
     """求解器对比测试"""
 
@@ -8,28 +8,45 @@
 import json
 import os
 import re
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, List, Any, Optional, Union, Tuple, Type, Callable
 
-from models import Teacher, Room, SubjectType
+from models import Teacher, Room, TimeSlot, Exam, SubjectType
 from config import SubjectConfig, PathConfig, get_exam_duration
 
+try:
+    import orjson
+except ImportError:  # orjson为可选加速依赖，缺失时回退到标准库json
+    orjson = None
+
+# 写文件缓冲区大小（64KB），避免json.dump逐段写入时频繁触发系统调用
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=128)
+def _duration_minutes(start: str, end: str) -> int:
+    """计算时间差（分钟），结果按(start, end)缓存；格式错误时抛出异常（异常不会被缓存）"""
+    start_hour, start_min = map(int, start.split(":"))
+    end_hour, end_min = map(int, end.split(":"))
+
+    start_dt = datetime.strptime(f"{start_hour:02d}:{start_min:02d}", "%H:%M")
+    end_dt = datetime.strptime(f"{end_hour:02d}:{end_min:02d}", "%H:%M")
+
+    duration = (end_dt - start_dt).total_seconds() / 60
+    return int(duration)
+
 
 class TimeUtils:
     """时间处理工具类"""
 
     @staticmethod
     def calculate_duration(start: str, end: str) -> int:
-        """计算时间差（分钟）"""
+        """计算时间差（分钟），合法输入的结果按(start, end)缓存，非法输入每次都报错并返回0"""
         try:
-            start_hour, start_min = map(int, start.split(":"))
-            end_hour, end_min = map(int, end.split(":"))
-
-            start_dt = datetime.strptime(f"{start_hour:02d}:{start_min:02d}", "%H:%M")
-            end_dt = datetime.strptime(f"{end_hour:02d}:{end_min:02d}", "%H:%M")
-
-            duration = (end_dt - start_dt).total_seconds() / 60
-            return int(duration)
+            return _duration_minutes(start, end)
         except Exception as e:
             print(f"时间计算错误 {start}-{end}: {e}")
             return 0
@@ -74,6 +91,11 @@ class FileUtils:
                 print(f"文件不存在: {file_path}")
                 return None
 
+            # orjson只接受UTF-8输入：一次读入全部字节后整体解析
+            if orjson is not None and encoding.lower().replace('-', '') == 'utf8':
+                with open(file_path, 'rb') as f:
+                    return orjson.loads(f.read())
+
             with open(file_path, 'r', encoding=encoding) as f:
                 return json.load(f)
         except Exception as e:
@@ -81,14 +103,23 @@ class FileUtils:
             return None
 
     @staticmethod
-    def save_json(data: Any, file_path: str, encoding: str = 'utf-8', indent: int = 2) -> bool:
-        """安全保存JSON文件"""
+    def save_json(data: Any, file_path: str, encoding: str = 'utf-8', indent: Optional[int] = 2,
+                  cls: Optional[Type[json.JSONEncoder]] = None) -> bool:
+        """安全保存JSON文件
+
+        indent为None时输出紧凑格式；指定cls时由该编码器处理自定义对象。
+        """
         try:
             # 确保目录存在
             FileUtils.ensure_directory(os.path.dirname(file_path))
 
-            with open(file_path, 'w', encoding=encoding) as f:
-                json.dump(data, f, ensure_ascii=False, indent=indent, default=str)
+            separators = (',', ':') if indent is None else None
+            with open(file_path, 'w', encoding=encoding, buffering=WRITE_BUFFER_SIZE) as f:
+                if cls is not None:
+                    json.dump(data, f, ensure_ascii=False, indent=indent, separators=separators, cls=cls)
+                else:
+                    json.dump(data, f, ensure_ascii=False, indent=indent, separators=separators, default=str)
+                f.flush()
             return True
         except Exception as e:
             print(f"保存JSON文件失败 {file_path}: {e}")
@@ -114,8 +145,9 @@ class FileUtils:
         try:
             FileUtils.ensure_directory(os.path.dirname(file_path))
 
-            with open(file_path, 'w', encoding=encoding) as f:
+            with open(file_path, 'w', encoding=encoding, buffering=WRITE_BUFFER_SIZE) as f:
                 f.write(content)
+                f.flush()
             return True
         except Exception as e:
             print(f"保存文本文件失败 {file_path}: {e}")
@@ -129,13 +161,14 @@ class DataUtils:
     def convert_to_teachers(teacher_data: List[Dict[str, Any]]) -> List[Teacher]:
         """转换教师数据为Teacher对象"""
         teachers = []
+        subject_map_get = SubjectConfig.SUBJECT_MAPPING.get  # 循环外绑定，省去每次的属性查找
 
         for teacher_dict in teacher_data:
             try:
                 # 获取科目类型
                 subject_name = teacher_dict.get('subject', '')
                 if isinstance(subject_name, str):
-                    subject_type = SubjectConfig.SUBJECT_MAPPING.get(subject_name, SubjectType.CHINESE)
+                    subject_type = subject_map_get(subject_name, SubjectType.CHINESE)
                 else:
                     # 如果已经是SubjectType枚举，直接使用
                     subject_type = subject_name
@@ -180,7 +213,9 @@ class DataUtils:
 
     @staticmethod
     def object_to_dict(obj: Any) -> Dict[str, Any]:
-        """对象转字典，支持dataclass"""
+        """对象转字典，支持dataclass（含使用__slots__的dataclass）"""
+        if is_dataclass(obj) and not isinstance(obj, type):
+            return {f.name: getattr(obj, f.name) for f in fields(obj)}
         if hasattr(obj, '__dict__'):
             return obj.__dict__
         else:
@@ -326,6 +361,38 @@ class ParseUtils:
             return []
 
 
+def _dataclass_encoder(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    """生成dataclass的字段转字典函数（字段名只解析一次）"""
+    names = tuple(f.name for f in fields(cls))
+
+    def encode(obj: Any) -> Dict[str, Any]:
+        return {name: getattr(obj, name) for name in names}
+
+    return encode
+
+
+# 按精确类型分派的编码函数，嵌套对象交由编码器继续递归处理
+_DISPATCH: Dict[type, Callable[[Any], Any]] = {
+    Teacher: _dataclass_encoder(Teacher),
+    Room: _dataclass_encoder(Room),
+    TimeSlot: _dataclass_encoder(TimeSlot),
+    Exam: _dataclass_encoder(Exam),
+    SubjectType: lambda o: o.value,
+}
+
+
+class ScheduleEncoder(json.JSONEncoder):
+    """排考数据JSON编码器，直接编码模型对象，无需预先构造嵌套字典"""
+
+    def default(self, o: Any) -> Any:
+        encode = _DISPATCH.get(type(o))
+        if encode is not None:
+            return encode(o)
+        if isinstance(o, Enum):
+            return o.value
+        return str(o)
+
+
 class ModelUtils:
     """模型工具类"""
 
@@ -335,12 +402,12 @@ class ModelUtils:
                             time_slots: List[Any],
                             exams: List[Any],
                             config: Any) -> Dict[str, Any]:
-        """序列化排考系统数据"""
+        """序列化排考系统数据（模型对象原样保留，保存时使用ScheduleEncoder编码）"""
         return {
-            'teachers': [DataUtils.object_to_dict(t) for t in teachers],
-            'rooms': [DataUtils.object_to_dict(r) for r in rooms],
-            'time_slots': [DataUtils.object_to_dict(ts) for ts in time_slots],
-            'exams': [DataUtils.object_to_dict(e) for e in exams],
+            'teachers': teachers,
+            'rooms': rooms,
+            'time_slots': time_slots,
+            'exams': exams,
             'config': DataUtils.object_to_dict(config)
         }
 
@@ -250,7 +250,6 @@ class DataFileValidator(BaseValidator):
             errors.append("考场数据文件不存在或无效")
             return False, errors, None
 
-        rooms_data = FileUtils.load_json(rooms_file)
         if not isinstance(rooms_data, list):
             errors.append("考场数据格式错误，应为列表")
             return False, errors, None
@@ -296,8 +295,12 @@ class ConversionValidator(BaseValidator):
 
     @staticmethod
     def validate_conversion_result(teachers: List, rooms: List, time_slots: List,
-                                exams: List) -> Tuple[bool, List[str]]:
-        """验证转换结果"""
+                                exams: List, skip_expensive_checks: bool = False) -> Tuple[bool, List[str]]:
+        """验证转换结果
+
+        skip_expensive_checks为True时只做数量检查，跳过考试与时间段/考场的交叉引用检查
+        （转换流程中考试直接引用已生成的时间段和考场，交叉引用必然成立）。
+        """
         errors = []
 
         # 验证教师数量
@@ -320,24 +323,20 @@ class ConversionValidator(BaseValidator):
         if len(exams) == 0:
             errors.append("转换结果：考试数量为0")
 
+        if skip_expensive_checks:
+            return len(errors) == 0, errors
+
         # 验证时间段与考试的关系
         if len(exams) > 0 and len(time_slots) > 0:
-            exam_time_slot_ids = set(exam.time_slot.id for exam in exams)
-            time_slot_ids = set(slot.id for slot in time_slots)
-
-            missing_slots = exam_time_slot_ids - time_slot_ids
+            time_slot_ids = {slot.id for slot in time_slots}
+            missing_slots = {exam.time_slot.id for exam in exams} - time_slot_ids
             if missing_slots:
                 errors.append(f"转换结果：考试使用的时间段不存在: {missing_slots}")
 
         # 验证考场与考试的关系
         if len(exams) > 0:
-            exam_room_ids = set()
-            for exam in exams:
-                for room in exam.rooms:
-                    exam_room_ids.add(room.id)
-
-            room_ids = set(room.id for room in rooms)
-            missing_rooms = exam_room_ids - room_ids
+            room_ids = {room.id for room in rooms}
+            missing_rooms = {room.id for exam in exams for room in exam.rooms} - room_ids
             if missing_rooms:
                 errors.append(f"转换结果：考试使用的考场不存在: {missing_rooms}")
 
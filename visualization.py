@@ -8,10 +8,15 @@ from typing import List, Dict, Any
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
+from heapq import nlargest
+from operator import itemgetter
 import os
 
 from models import ExamSchedule, Assignment, SubjectType
 
+# 按加权总负荷取值的C实现key函数（替代lambda）
+_TOTAL_LOAD = itemgetter('total_weighted_load')
+
 
 class ResultVisualizer:
     """结果可视化器"""
@@ -151,7 +156,7 @@ class ResultVisualizer:
                 </tr>
         """
 
-        for stat in sorted(teacher_stats, key=lambda x: x['total_weighted_load'], reverse=True)[:20]:
+        for stat in nlargest(20, teacher_stats, key=_TOTAL_LOAD):
             details += f"""
                 <tr>
                     <td>{stat['teacher_name']}</td><td>{stat['subject']}</td>
@@ -230,8 +235,7 @@ class ResultVisualizer:
         matrix = np.zeros((len(teachers), len(time_slots)))
 
         for i, teacher in enumerate(teachers):
-            assignments = self.schedule.get_teacher_assignments(teacher.id)
-            for assignment in assignments:
+            for assignment in self.schedule.iter_teacher_assignments(teacher.id):
                 j = time_slots.index(assignment.time_slot)
                 matrix[i][j] = 1 if assignment.is_invigilation else 0.5
 
@@ -793,8 +797,8 @@ class ResultVisualizer:
         # 找出负荷最大和最小的教师
         teacher_stats = self.stats.get('teacher_stats', [])
         if teacher_stats:
-            max_teacher = max(teacher_stats, key=lambda x: x['total_weighted_load'])
-            min_teacher = min(teacher_stats, key=lambda x: x['total_weighted_load'])
+            max_teacher = max(teacher_stats, key=_TOTAL_LOAD)
+            min_teacher = min(teacher_stats, key=_TOTAL_LOAD)
 
             summary['load_analysis']['max_load_teacher'] = f"{max_teacher['teacher_name']}({max_teacher['total_weighted_load']:.2f})"
             summary['load_analysis']['min_load_teacher'] = f"{min_teacher['teacher_name']}({min_teacher['total_weighted_load']:.2f})"